@@ -0,0 +1,237 @@
+"""Measures the performance of translation lookups with synthetic catalogs.
+
+This runs entirely offline by generating catalogs into a temporary
+directory and translating messages with a fake interaction.
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable
+
+import discord
+from discord import app_commands
+from discord.app_commands import locale_str as _
+
+from dpygt.bot import DPyGT
+from dpygt.catalog import write_mo
+from dpygt.config import load_default_config
+from dpygt.sync import get_command_payload
+from dpygt.translator import (
+    DOMAIN,
+    GettextTranslator,
+    locale_to_gnu,
+    plural_locale_str,
+    translate,
+)
+
+HEADER = (
+    b"Content-Type: text/plain; charset=UTF-8\n"
+    b"Plural-Forms: nplurals=2; plural=(n > 1);\n"
+)
+
+
+def singular(i: int) -> str:
+    return f"Synthetic message #{i} with {{0}}"
+
+
+def plural(i: int) -> tuple[str, str]:
+    return f"Synthetic item #{i}: {{0}} thing", f"Synthetic item #{i}: {{0}} things"
+
+
+def write_catalogs(localedir: Path, locales: list[discord.Locale], n: int) -> None:
+    for locale in locales:
+        messages = {b"": HEADER}
+        for i in range(n):
+            messages[singular(i).encode()] = f"[{locale}] {singular(i)}".encode()
+            one, many = plural(i)
+            messages[f"{one}\0{many}".encode()] = (
+                f"[{locale}] {one}\0[{locale}] {many}".encode()
+            )
+            messages[f"command-{i}".encode()] = f"{locale}-command-{i}".encode()
+            messages[f"Description #{i}".encode()] = (
+                f"[{locale}] Description #{i}".encode()
+            )
+
+        path = localedir / locale_to_gnu(locale) / "LC_MESSAGES" / f"{DOMAIN}.mo"
+        path.parent.mkdir(parents=True)
+        path.write_bytes(write_mo(messages))
+
+
+def add_commands(tree: app_commands.CommandTree, n: int) -> None:
+    async def callback(interaction: discord.Interaction) -> None: ...
+
+    for i in range(min(n, 100)):  # Discord's limit for global commands
+        command = app_commands.Command(
+            name=_(f"command-{i}"),
+            description=_(f"Description #{i}"),
+            callback=callback,
+        )
+        tree.add_command(command)
+
+
+class Result:
+    def __init__(self, name: str, samples: list[int], peak: int) -> None:
+        self.name = name
+        self.samples = sorted(samples)
+        self.peak = peak
+
+    def row(self) -> str:
+        total = sum(self.samples)
+        ops = len(self.samples) / (total / 1e9) if total else float("inf")
+        p50 = statistics.median(self.samples) / 1000
+        p99 = self.samples[int(len(self.samples) * 0.99) - 1] / 1000
+        peak = self.peak / 1024
+        return f"{self.name:<34} {ops:>12,.0f} {p50:>10.2f} {p99:>10.2f} {peak:>10.1f}"
+
+
+async def measure(
+    name: str,
+    func: Callable[[int], Awaitable[Any]],
+    iterations: int,
+) -> Result:
+    # Warm up caches first, since we're interested in the steady state
+    for i in range(min(iterations, 100)):
+        await func(i)
+
+    samples: list[int] = []
+    for i in range(iterations):
+        start = time.perf_counter_ns()
+        await func(i)
+        samples.append(time.perf_counter_ns() - start)
+
+    tracemalloc.start()
+    for i in range(iterations):
+        await func(i)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return Result(name, samples, peak)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-b",
+        "--backend",
+        choices=("gettext", "mmap"),
+        default="gettext",
+        help="The catalog backend to benchmark",
+    )
+    parser.add_argument(
+        "-i",
+        "--iterations",
+        default=10000,
+        help="The number of lookups to time in each scenario",
+        type=int,
+    )
+    parser.add_argument(
+        "-l",
+        "--locales",
+        default=10,
+        help="The number of locales to generate catalogs for",
+        type=int,
+    )
+    parser.add_argument(
+        "-m",
+        "--messages",
+        default=500,
+        help="The number of each kind of message in every catalog",
+        type=int,
+    )
+    args = parser.parse_args()
+
+    all_locales = [locale for locale in discord.Locale]
+    locales = all_locales[1 : args.locales + 1]
+    missing_locale = all_locales[0]
+    locale = locales[0]
+    n: int = args.messages
+
+    config = load_default_config()
+    bot = DPyGT(config)
+    add_commands(bot.tree, n)
+    interaction: Any = SimpleNamespace(locale=locale, client=bot)
+    missing_interaction: Any = SimpleNamespace(locale=missing_locale, client=bot)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        localedir = Path(tmp)
+        write_catalogs(localedir, locales, n)
+
+        translator = GettextTranslator(localedir=localedir, backend=args.backend)
+        start = time.perf_counter_ns()
+        await bot.tree.set_translator(translator)
+        load_ms = (time.perf_counter_ns() - start) / 1e6
+
+        other = app_commands.TranslationContext(
+            location=app_commands.TranslationContextLocation.other,
+            data=None,
+        )
+        singulars = [_(singular(i)) for i in range(n)]
+        plurals = [plural_locale_str(*plural(i)) for i in range(n)]
+        unknowns = [_(f"Unknown message #{i}") for i in range(n)]
+
+        async def translator_singular(i: int) -> Any:
+            return await translator.translate(singulars[i % n], locale, other)
+
+        async def translator_plural(i: int) -> Any:
+            context = app_commands.TranslationContext(
+                location=app_commands.TranslationContextLocation.other,
+                data=i,
+            )
+            return await translator.translate(plurals[i % n], locale, context)
+
+        async def translator_missing_locale(i: int) -> Any:
+            return await translator.translate(singulars[i % n], missing_locale, other)
+
+        async def translator_missing_msgid(i: int) -> Any:
+            return await translator.translate(unknowns[i % n], locale, other)
+
+        async def helper_singular(i: int) -> Any:
+            return await translate(singulars[i % n], interaction)
+
+        async def helper_plural(i: int) -> Any:
+            return await translate(plurals[i % n], interaction, data=i)
+
+        async def helper_missing_locale(i: int) -> Any:
+            return await translate(singulars[i % n], missing_interaction)
+
+        async def helper_missing_msgid(i: int) -> Any:
+            return await translate(unknowns[i % n], interaction)
+
+        async def tree_localization(i: int) -> Any:
+            return await get_command_payload(bot.tree)
+
+        scenarios: list[tuple[str, Callable[[int], Awaitable[Any]], int]] = [
+            ("translator: singular", translator_singular, args.iterations),
+            ("translator: plural", translator_plural, args.iterations),
+            ("translator: missing locale", translator_missing_locale, args.iterations),
+            ("translator: missing msgid", translator_missing_msgid, args.iterations),
+            ("translate(): singular", helper_singular, args.iterations),
+            ("translate(): plural", helper_plural, args.iterations),
+            ("translate(): missing locale", helper_missing_locale, args.iterations),
+            ("translate(): missing msgid", helper_missing_msgid, args.iterations),
+            ("tree localization", tree_localization, max(args.iterations // 1000, 10)),
+        ]
+
+        print(
+            f"backend={args.backend} locales={len(locales)} messages={n} "
+            f"commands={len(bot.tree.get_commands())} load={load_ms:.1f}ms"
+        )
+        print(
+            f"{'scenario':<34} {'ops/sec':>12} {'p50 (us)':>10} "
+            f"{'p99 (us)':>10} {'peak KiB':>10}"
+        )
+        for name, func, iterations in scenarios:
+            result = await measure(name, func, iterations)
+            print(result.row())
+
+        await bot.tree.set_translator(None)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
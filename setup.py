@@ -6,21 +6,50 @@ Reference: https://setuptools.pypa.io/en/latest/userguide/extension.html#setupto
 """
 
 # pyright: strict
-import shutil
-import subprocess
+import importlib
+import sys
 from pathlib import Path
-from typing import Iterator
-import warnings
+from typing import Iterable, Iterator, Protocol, cast
 
 from setuptools import Command, setup  # type: ignore  # setup() partially unknown
 from setuptools.command.build import SubCommand, build  # type: ignore  # missing stub
 
 
+class _CatalogModule(Protocol):
+    def compile_po_files(
+        self,
+        files: Iterable[tuple[Path, Path]],
+        *,
+        force: bool = False,
+    ) -> list[Path]: ...
+
+    def bundle_mo_files(self, mo_paths: Iterable[Path]) -> list[Path]: ...
+
+
+def load_catalog_module() -> _CatalogModule:
+    # The catalog module only depends on the standard library,
+    # so we can load it without the package being installed.
+    # It's imported from sys.path so worker processes can import it too.
+    # utils/build_mo.py also uses this, so it can be run from any directory.
+    sys.path.insert(0, str(Path(__file__).resolve().parent / "src" / "dpygt"))
+    return cast(_CatalogModule, importlib.import_module("catalog"))
+
+
 class build_mo(Command, SubCommand):
-    """Builds machine object translation files."""
+    """Builds machine object translation files.
+
+    With the ``--bundle`` option, the compiled catalogs of each package
+    are also packed into a single bundle that can be loaded at once.
+    """
 
     build_lib = "build/lib"
     editable_mode = False  # shouldn't be necessary but pyright wants this
+    bundle = False
+
+    user_options = [
+        ("bundle", None, "pack compiled catalogs into a single bundle per package"),
+    ]
+    boolean_options = ["bundle"]
 
     _source_root = Path("src")
 
@@ -32,6 +61,7 @@ class build_mo(Command, SubCommand):
         to their default values. Note that these values may be overwritten during
         the build.
         """
+        self.bundle = False
 
     def finalize_options(self) -> None:
         """
@@ -46,27 +76,29 @@ class build_mo(Command, SubCommand):
         (Side effects **SHOULD** only take place when ``run`` is executed,
         for example, creating new files or writing to the terminal output).
         """
-        msgfmt = shutil.which("msgfmt")
-        if msgfmt is None:
-            return warnings.warn(
-                "msgfmt is not available, building .mo files will be skipped",
-                RuntimeWarning,
-            )
-
+        files: list[tuple[Path, Path]] = []
         for source_po in self._find_po_files():
             output_po = self._get_output_path(source_po)
             output_mo = output_po.with_suffix(".mo")
 
             if not self.editable_mode:
-                # Parent directory required for msgfmt to work correctly
+                # Parent directory required for the .mo file to be written
                 output_mo.parent.mkdir(parents=True, exist_ok=True)
 
-            subprocess.check_call(["msgfmt", "-o", output_mo, output_po])
+            files.append((output_po, output_mo))
 
-            if not self.editable_mode:
-                # Space savings
+        # Falls back to a pure-Python compiler if msgfmt isn't installed
+        catalog = load_catalog_module()
+        catalog.compile_po_files(files)
+
+        if not self.editable_mode:
+            # Space savings
+            for output_po, _ in files:
                 output_po.unlink()
 
+        if self.bundle:
+            catalog.bundle_mo_files(mo for _, mo in files)
+
     def get_source_files(self) -> list[str]:
         """
         Return a list of all files that are used by the command to create
@@ -90,7 +122,10 @@ class build_mo(Command, SubCommand):
            in ``get_output_mapping()`` plus files that are generated during the build
            and don't correspond to any source file already present in the project.
         """
-        return list(self.get_output_mapping().keys())
+        outputs = list(self.get_output_mapping().keys())
+        if self.bundle:
+            outputs.extend(str(path) for path in self._get_bundle_paths())
+        return outputs
 
     def get_output_mapping(self) -> dict[str, str]:
         """
@@ -119,6 +154,15 @@ class build_mo(Command, SubCommand):
             for po_path in package_path.rglob("*.po"):
                 yield po_path
 
+    def _get_bundle_paths(self) -> list[Path]:
+        """Returns the bundles that would be generated from the PO files."""
+        paths: dict[Path, None] = {}
+        for source_po in self._find_po_files():
+            output_mo = self._get_output_path(source_po).with_suffix(".mo")
+            # <localedir>/<language>/LC_MESSAGES/<domain>.mo
+            paths[output_mo.parents[2] / f"{output_mo.stem}.bundle"] = None
+        return list(paths)
+
     def _get_output_path(self, path: Path) -> Path:
         if self.editable_mode:
             return path
@@ -130,4 +174,5 @@ class build_mo(Command, SubCommand):
     build.sub_commands.append(("build_mo", None))
 
 
-setup(cmdclass={"build_mo": build_mo})
+if __name__ == "__main__":
+    setup(cmdclass={"build_mo": build_mo})
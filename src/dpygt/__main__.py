@@ -1,4 +1,5 @@
 import argparse
+import asyncio
 import importlib.metadata
 import logging
 import sys
@@ -6,7 +7,8 @@ import sys
 import discord
 
 from .bot import DPyGT
-from .config import load_config
+from .config import DPyGTConfig, load_config
+from .manifest import MANIFEST_PATH, build_manifest, write_manifest
 
 parser = argparse.ArgumentParser(
     prog=__package__,
@@ -19,6 +21,11 @@ parser.add_argument(
     default=0,
     help="Increase logging verbosity",
 )
+parser.add_argument(
+    "--build-manifest",
+    action="store_true",
+    help="Record the commands of each extension for lazy loading, then exit",
+)
 
 args = parser.parse_args()
 
@@ -37,6 +44,18 @@ discord.utils.setup_logging(
 
 config = load_config()
 
+
+async def write_extension_manifest(config: DPyGTConfig) -> None:
+    async with DPyGT(config) as bot:
+        manifest = await build_manifest(bot, config.bot.extensions, __package__)
+    write_manifest(manifest)
+    print(f"Wrote {len(manifest)} extension(s) to {MANIFEST_PATH}")
+
+
+if args.build_manifest:
+    asyncio.run(write_extension_manifest(config))
+    sys.exit()
+
 if config.bot.token == "":
     sys.exit(
         "No bot token has been supplied by a config.toml file.\n"
@@ -1,28 +1,59 @@
 from __future__ import annotations
 
+import asyncio
 import importlib.metadata
+import importlib.util
 import logging
-from typing import TYPE_CHECKING
+import time
+from typing import TYPE_CHECKING, Any, Iterable
 
+import discord
+from discord import app_commands
 from discord.ext import commands
 
+from .config import ConfigDiff, diff_config
+from .manifest import ExtensionEntry, get_extension_digest, load_manifest
+from .metrics import InMemoryMetrics
 from .translator import GettextTranslator
 
 if TYPE_CHECKING:
-    from .config import DPyGTSettings
+    from .config import DPyGTConfig
 
 log = logging.getLogger(__name__)
 
 
+class DPyGTCommandTree(app_commands.CommandTree["DPyGT"]):
+    async def interaction_check(self, interaction: discord.Interaction[DPyGT]) -> bool:
+        # Make sure deferred extensions are loaded before their command is looked up
+        if interaction.type in (
+            discord.InteractionType.application_command,
+            discord.InteractionType.autocomplete,
+        ):
+            data: Any = interaction.data
+            key = (data.get("type", 1), data["name"])
+            name = self.client._lazy_app_commands.get(key)
+            if name is not None:
+                await self.client.load_lazy_extensions([name])
+        return True
+
+
 # https://discordpy.readthedocs.io/en/stable/ext/commands/api.html
 class DPyGT(commands.Bot):
-    def __init__(self, config: DPyGTSettings):
+    def __init__(self, config: DPyGTConfig):
         super().__init__(
             command_prefix=commands.when_mentioned,
-            intents=config.bot.intents.create_intents(),
+            intents=config.bot.create_intents(),
             strip_after_prefix=True,
+            tree_cls=DPyGTCommandTree,
         )
         self.config = config
+        self.metrics = InMemoryMetrics()
+        # Set once each extension being loaded by load_extensions() finishes
+        self._extension_events: dict[str, asyncio.Event] = {}
+        # Extensions deferred until one of their commands is used
+        self._lazy_extensions: dict[str, ExtensionEntry] = {}
+        self._lazy_app_commands: dict[tuple[int, str], str] = {}
+        self._lazy_commands: dict[str, str] = {}
 
     async def _maybe_load_jishaku(self) -> None:
         if not self.config.bot.allow_jishaku:
@@ -36,13 +67,251 @@ class DPyGT(commands.Bot):
             await self.load_extension("jishaku")
             log.info("Loaded jishaku extension (version: %s)", version)
 
+    async def _setup_translator(self) -> None:
+        translator = GettextTranslator(
+            backend=self.config.translator.catalog_backend,
+            use_bundle=self.config.translator.use_bundle,
+            fallbacks=self.config.translator.create_fallbacks(),
+            metrics=self.metrics,
+        )
+        await self.tree.set_translator(translator)
+        await translator.build_localization_table(self.tree)
+
+    async def load_extensions(self, names: Iterable[str]) -> dict[str, Exception]:
+        """Loads multiple extensions concurrently.
+
+        Relative names are resolved from this package. An extension that
+        depends on another can wait for it in its ``setup()`` function
+        using :meth:`wait_for_extensions()`.
+
+        :returns: The extensions that failed to load, mapped to their exceptions.
+
+        """
+        names = list(names)
+        if not names:
+            return {}
+
+        resolved = [importlib.util.resolve_name(name, __package__) for name in names]
+        for name in resolved:
+            self._extension_events.setdefault(name, asyncio.Event())
+
+        async def load(name: str) -> None:
+            start = time.perf_counter()
+            try:
+                await self.load_extension(name)
+            finally:
+                event = self._extension_events.pop(name, None)
+                if event is not None:
+                    event.set()
+
+            elapsed = time.perf_counter() - start
+            self.metrics.observe("extension_load_seconds", elapsed, extension=name)
+            log.info("Loaded extension %s in %.1fms", name, elapsed * 1000)
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(load(name) for name in resolved),
+            return_exceptions=True,
+        )
+        log.info(
+            "Loaded %d extensions in %.1fms",
+            len(names),
+            (time.perf_counter() - start) * 1000,
+        )
+
+        errors: dict[str, Exception] = {}
+        for name, result in zip(names, results):
+            if isinstance(result, BaseException) and not isinstance(result, Exception):
+                raise result
+            elif isinstance(result, Exception):
+                log.error("Failed to load extension %s", name, exc_info=result)
+                errors[name] = result
+        return errors
+
+    async def wait_for_extensions(self, *names: str) -> None:
+        """Waits for other extensions to finish loading.
+
+        This is meant to be used by extensions that depend on each other
+        when they are loaded concurrently with :meth:`load_extensions()`.
+        Dependencies must not be circular.
+
+        :raises commands.ExtensionNotLoaded:
+            One of the extensions is not loaded and isn't being loaded.
+
+        """
+        for name in names:
+            name = importlib.util.resolve_name(name, __package__)
+            event = self._extension_events.get(name)
+            if event is not None:
+                await event.wait()
+            if name not in self.extensions:
+                raise commands.ExtensionNotLoaded(name)
+
+    def _defer_extensions(self, names: Iterable[str]) -> list[str]:
+        """Defers loading extensions until one of their commands is used.
+
+        Extensions can only be deferred if lazy loading is enabled
+        and the manifest has an up-to-date entry for them.
+
+        :returns: The extensions that must be loaded immediately.
+
+        """
+        names = list(names)
+        if not self.config.bot.lazy_extensions:
+            return names
+
+        manifest = load_manifest()
+        eager: list[str] = []
+        for name in names:
+            entry = manifest.get(name)
+            if entry is None:
+                eager.append(name)
+                continue
+            elif entry.digest != get_extension_digest(name, __package__):
+                log.warning("Manifest is out of date for %s, loading it now", name)
+                eager.append(name)
+                continue
+
+            name = importlib.util.resolve_name(name, __package__)
+            self._lazy_extensions[name] = entry
+            for key in entry.app_commands:
+                self._lazy_app_commands[key] = name
+            for command in entry.commands:
+                self._lazy_commands[command] = name
+
+        if len(eager) < len(names):
+            log.info("Deferred loading %d extensions", len(names) - len(eager))
+        return eager
+
+    def _forget_lazy_extension(self, name: str) -> bool:
+        entry = self._lazy_extensions.pop(name, None)
+        if entry is None:
+            return False
+
+        for key in entry.app_commands:
+            self._lazy_app_commands.pop(key, None)
+        for command in entry.commands:
+            self._lazy_commands.pop(command, None)
+        return True
+
+    async def load_lazy_extensions(
+        self,
+        names: Iterable[str] | None = None,
+    ) -> dict[str, Exception]:
+        """Loads extensions that were deferred until their commands were used.
+
+        Extensions that are already being loaded are waited on instead.
+
+        :param names:
+            The resolved names of the extensions to load.
+            If None, every deferred extension is loaded.
+        :returns: The extensions that failed to load, mapped to their exceptions.
+
+        """
+        if names is None:
+            names = list(self._lazy_extensions)
+
+        pending: list[str] = []
+        loading: list[str] = []
+        for name in names:
+            if name in self._extension_events:
+                loading.append(name)
+            elif name in self._lazy_extensions:
+                pending.append(name)
+
+        errors = await self.load_extensions(pending)
+        for name in pending:
+            self._forget_lazy_extension(name)
+
+        for name in loading:
+            try:
+                await self.wait_for_extensions(name)
+            except commands.ExtensionNotLoaded as e:
+                errors[name] = e
+
+        return errors
+
+    async def get_context(self, origin: Any, /, **kwargs: Any) -> Any:
+        ctx = await super().get_context(origin, **kwargs)
+        if ctx.command is None and ctx.invoked_with in self._lazy_commands:
+            # Load the deferred extension and look up the command again
+            await self.load_lazy_extensions([self._lazy_commands[ctx.invoked_with]])
+            ctx = await super().get_context(origin, **kwargs)
+        return ctx
+
     async def setup_hook(self) -> None:
-        for path in self.config.bot.extensions:
-            await self.load_extension(path, package=__package__)
-        log.info("Loaded %d extensions", len(self.config.bot.extensions))
-        await self._maybe_load_jishaku()
+        errors, _ = await asyncio.gather(
+            self.load_extensions(self._defer_extensions(self.config.bot.extensions)),
+            self._maybe_load_jishaku(),
+        )
+        if errors:
+            raise next(iter(errors.values()))
+
+        await self._setup_translator()
+
+    async def apply_config(
+        self,
+        config: DPyGTConfig,
+    ) -> tuple[ConfigDiff, dict[str, Exception]]:
+        """Replaces the bot's configuration and applies any changes that
+        can take effect without reconnecting.
+
+        Extensions that were added or removed are loaded and unloaded
+        concurrently, deferred extensions are loaded if lazy loading was
+        turned off, and the translator is recreated if its settings changed.
+        Settings listed by :attr:`ConfigDiff.requires_reconnect` and
+        :attr:`ConfigDiff.requires_extension_reload` are not applied.
+
+        :returns:
+            The differences between the old and new configuration,
+            along with any extensions that failed to load or unload.
+
+        """
+        diff = diff_config(self.config, config)
+        self.config = config
+        if not diff:
+            return diff, {}
+
+        # Deferred extensions were never loaded, so they only need to be forgotten
+        removed = [
+            name
+            for name in diff.extensions_removed
+            if not self._forget_lazy_extension(
+                importlib.util.resolve_name(name, __package__)
+            )
+        ]
+        results = await asyncio.gather(
+            *(self.unload_extension(name, package=__package__) for name in removed),
+            return_exceptions=True,
+        )
+        errors: dict[str, Exception] = {}
+        for name, result in zip(removed, results):
+            if isinstance(result, Exception):
+                log.error("Failed to unload extension %s", name, exc_info=result)
+                errors[name] = result
+
+        added = self._defer_extensions(diff.extensions_added)
+        errors |= await self.load_extensions(added)
+
+        if "bot.lazy_extensions" in diff.changed and not config.bot.lazy_extensions:
+            # Extensions deferred before would otherwise stay unloaded until used
+            errors |= await self.load_lazy_extensions()
+
+        if "bot.allow_jishaku" in diff.changed:
+            if config.bot.allow_jishaku:
+                await self._maybe_load_jishaku()
+            elif "jishaku" in self.extensions:
+                await self.unload_extension("jishaku")
+
+        if any(name.startswith("translator.") for name in diff.changed):
+            await self._setup_translator()
+
+        for name in diff.requires_reconnect:
+            log.warning("Changes to %s will apply after reconnecting", name)
+        for name in diff.requires_extension_reload:
+            log.warning("Changes to %s will apply after reloading extensions", name)
 
-        await self.tree.set_translator(GettextTranslator())
+        return diff, errors
 
 
 class Context(commands.Context[DPyGT]): ...
@@ -0,0 +1,806 @@
+"""Provides readers and writers for gettext catalogs.
+
+This module only depends on the standard library.
+
+"""
+
+from __future__ import annotations
+
+import functools
+import gettext
+import mmap
+import os
+import re
+import shutil
+import struct
+import subprocess
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, Union
+
+Buffer = Union[bytes, mmap.mmap]
+
+LE_MAGIC = 0x950412DE
+BE_MAGIC = 0xDE120495
+
+BUNDLE_MAGIC = b"DPGB"
+BUNDLE_VERSION = 1
+_BUNDLE_HEADER = struct.Struct("<4s5I")
+_BUNDLE_LOCALE = struct.Struct("<3I")
+_BUNDLE_ENTRY = struct.Struct("<3I")
+
+
+def hash_string(s: bytes) -> int:
+    """Computes the hashpjw value used by the hash table of .mo files."""
+    hval = 0
+    for c in s:
+        hval = (hval << 4) + c
+        g = hval & 0xF0000000
+        if g:
+            hval ^= g >> 24
+            hval ^= g
+    return hval
+
+
+def _next_prime(n: int) -> int:
+    n = max(n, 3) | 1
+    while any(n % d == 0 for d in range(3, int(n**0.5) + 1, 2)):
+        n += 2
+    return n
+
+
+def read_mo(data: bytes) -> dict[bytes, bytes]:
+    """Reads every encoded message from the contents of a .mo file.
+
+    This is the inverse of :func:`write_mo()`.
+
+    :raises OSError: The data is not a valid .mo file.
+
+    """
+    if len(data) < 28:
+        raise OSError(0, "Bad magic number")
+
+    (magic,) = struct.unpack_from("<I", data, 0)
+    if magic == LE_MAGIC:
+        order = "<"
+    elif magic == BE_MAGIC:
+        order = ">"
+    else:
+        raise OSError(0, "Bad magic number")
+
+    _, n, orig_offset, trans_offset = struct.unpack_from(f"{order}4I", data, 4)
+    messages: dict[bytes, bytes] = {}
+    for i in range(n):
+        olen, ooff = struct.unpack_from(f"{order}2I", data, orig_offset + 8 * i)
+        tlen, toff = struct.unpack_from(f"{order}2I", data, trans_offset + 8 * i)
+        messages[data[ooff : ooff + olen]] = data[toff : toff + tlen]
+    return messages
+
+
+def write_mo(messages: Mapping[bytes, bytes]) -> bytes:
+    """Serializes encoded messages into the .mo format.
+
+    The output includes a hash table in the same layout as GNU msgfmt.
+
+    :param messages:
+        A mapping of original messages to their translations.
+        Plural messages should have their singular and plural IDs,
+        as well as each translated form, separated by NUL bytes.
+        The metadata is stored as the translation of an empty string.
+
+    """
+    keys = sorted(messages)
+    n = len(keys)
+    hash_size = _next_prime(n * 4 // 3)
+
+    orig_offset = 28
+    trans_offset = orig_offset + 8 * n
+    hash_offset = trans_offset + 8 * n
+    strings_offset = hash_offset + 4 * hash_size
+
+    hash_table = [0] * hash_size
+    originals = bytearray()
+    translations = bytearray()
+    orig_entries: list[int] = []
+    trans_entries: list[int] = []
+    for i, key in enumerate(keys):
+        orig_entries += [len(key), len(originals)]
+        originals += key + b"\0"
+
+        value = messages[key]
+        trans_entries += [len(value), len(translations)]
+        translations += value + b"\0"
+
+        hval = hash_string(key.split(b"\0", 1)[0])
+        idx = hval % hash_size
+        incr = 1 + hval % (hash_size - 2)
+        while hash_table[idx] != 0:
+            if idx >= hash_size - incr:
+                idx -= hash_size - incr
+            else:
+                idx += incr
+        hash_table[idx] = i + 1
+
+    # Make string offsets absolute
+    translations_offset = strings_offset + len(originals)
+    orig_entries[1::2] = [o + strings_offset for o in orig_entries[1::2]]
+    trans_entries[1::2] = [o + translations_offset for o in trans_entries[1::2]]
+
+    return b"".join(
+        [
+            struct.pack(
+                "<7I",
+                LE_MAGIC,
+                0,
+                n,
+                orig_offset,
+                trans_offset,
+                hash_size,
+                hash_offset,
+            ),
+            struct.pack(f"<{2 * n}I", *orig_entries),
+            struct.pack(f"<{2 * n}I", *trans_entries),
+            struct.pack(f"<{hash_size}I", *hash_table),
+            originals,
+            translations,
+        ]
+    )
+
+
+_PO_ESCAPE = re.compile(r"\\(?:([0-7]{1,3})|x([0-9a-fA-F]+)|(.))")
+_PO_SIMPLE_ESCAPES = {
+    "a": "\a",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    "v": "\v",
+}
+_PO_KEYWORD = re.compile(r"(msgctxt|msgid_plural|msgid|msgstr)(?:\[(\d+)\])?\s+(\".*)")
+_PO_CHARSET = re.compile(r"charset=([^\s;]+)", re.IGNORECASE)
+
+
+def _unescape_po(s: str) -> str:
+    def replace(m: re.Match[str]) -> str:
+        octal, hexadecimal, char = m.groups()
+        if octal is not None:
+            return chr(int(octal, 8))
+        elif hexadecimal is not None:
+            return chr(int(hexadecimal, 16))
+        return _PO_SIMPLE_ESCAPES.get(char, char)
+
+    return _PO_ESCAPE.sub(replace, s)
+
+
+class _PoEntry:
+    __slots__ = ("msgctxt", "msgid", "msgid_plural", "msgstr", "fuzzy")
+
+    def __init__(self) -> None:
+        self.msgctxt: str | None = None
+        self.msgid: str | None = None
+        self.msgid_plural: str | None = None
+        self.msgstr: dict[int, str] = {}
+        self.fuzzy = False
+
+
+def parse_po(text: str) -> dict[bytes, bytes]:
+    """Parses the contents of a .po file into encoded messages.
+
+    Like msgfmt, fuzzy, obsolete and untranslated messages are left out,
+    and the messages are encoded with the charset declared in the header.
+    The result can be passed directly to :func:`write_mo()`.
+
+    :raises ValueError: The text is not a valid .po file.
+
+    """
+    entries: list[_PoEntry] = []
+    entry = _PoEntry()
+    section: str | None = None
+    index = 0
+
+    def append(value: str) -> None:
+        if section == "msgctxt":
+            entry.msgctxt = (entry.msgctxt or "") + value
+        elif section == "msgid":
+            entry.msgid = (entry.msgid or "") + value
+        elif section == "msgid_plural":
+            entry.msgid_plural = (entry.msgid_plural or "") + value
+        else:
+            entry.msgstr[index] = entry.msgstr.get(index, "") + value
+
+    for lineno, line in enumerate(text.splitlines(), start=1):
+        line = line.strip()
+        if not line:
+            continue
+        elif line.startswith("#~"):
+            # Obsolete messages are never compiled
+            continue
+        elif line.startswith("#,"):
+            if section is not None and section.startswith("msgstr"):
+                entries.append(entry)
+                entry, section = _PoEntry(), None
+            flags = {flag.strip() for flag in line[2:].split(",")}
+            entry.fuzzy = entry.fuzzy or "fuzzy" in flags
+            continue
+        elif line.startswith("#"):
+            continue
+
+        m = _PO_KEYWORD.fullmatch(line)
+        if m is not None:
+            keyword, keyword_index, line = m.groups()
+            if keyword in ("msgctxt", "msgid") and section in ("msgstr", None):
+                if section is not None:
+                    entries.append(entry)
+                    entry = _PoEntry()
+            elif keyword == "msgstr" and section in ("msgctxt", None):
+                raise ValueError(f"line {lineno}: msgstr without a msgid")
+            section = keyword
+            index = int(keyword_index or 0)
+            if keyword == "msgstr":
+                entry.msgstr.setdefault(index, "")
+
+        if not (len(line) >= 2 and line[0] == line[-1] == '"'):
+            raise ValueError(f"line {lineno}: expected a quoted string")
+        elif section is None:
+            raise ValueError(f"line {lineno}: string without a keyword")
+        append(_unescape_po(line[1:-1]))
+
+    if section == "msgstr":
+        entries.append(entry)
+    elif section is not None:
+        raise ValueError("unexpected end of file, missing msgstr")
+
+    charset = "utf-8"
+    messages: dict[str, str] = {}
+    for entry in entries:
+        assert entry.msgid is not None
+        forms = [entry.msgstr[i] for i in sorted(entry.msgstr)]
+        if entry.msgid and (entry.fuzzy or not any(forms)):
+            continue
+
+        key = entry.msgid
+        if entry.msgid_plural is not None:
+            key = f"{key}\0{entry.msgid_plural}"
+        if entry.msgctxt is not None:
+            key = f"{entry.msgctxt}\x04{key}"
+        messages[key] = "\0".join(forms)
+
+        if key == "":
+            m = _PO_CHARSET.search(messages[key])
+            if m is not None and m[1].upper() != "CHARSET":
+                charset = m[1]
+
+    return {
+        key.encode(charset): value.encode(charset) for key, value in messages.items()
+    }
+
+
+def compile_po(po_path: Path, mo_path: Path) -> None:
+    """Compiles a .po file into a .mo file without needing msgfmt.
+
+    The .mo file is written to a temporary file first and then renamed,
+    so a running process never sees a partially written catalog.
+
+    :raises ValueError: The .po file could not be parsed.
+
+    """
+    try:
+        messages = parse_po(po_path.read_text("utf-8"))
+    except ValueError as e:
+        raise ValueError(f"{po_path}: {e}") from None
+
+    temp = mo_path.with_name(mo_path.name + ".tmp")
+    temp.write_bytes(write_mo(messages))
+    os.replace(temp, mo_path)
+
+
+def _compile_po_with_msgfmt(msgfmt: str, po_path: Path, mo_path: Path) -> None:
+    subprocess.check_call([msgfmt, "-o", mo_path, po_path])
+
+
+def is_up_to_date(po_path: Path, mo_path: Path) -> bool:
+    """Checks if a .mo file was compiled after its .po file was last modified."""
+    try:
+        return po_path.stat().st_mtime_ns < mo_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+
+def compile_po_files(
+    files: Iterable[tuple[Path, Path]],
+    *,
+    force: bool = False,
+    max_workers: int | None = None,
+) -> list[Path]:
+    """Compiles .po files into .mo files concurrently.
+
+    msgfmt is used if it is installed. Otherwise, catalogs are compiled
+    with :func:`compile_po()` across a pool of processes.
+
+    :param files: Pairs of .po files and the .mo files to compile them into.
+    :param force:
+        If True, compile every file even if the .mo file is newer
+        than its .po file.
+    :param max_workers: The maximum number of catalogs to compile at once.
+    :returns: The .mo files that were compiled.
+
+    """
+    pending = [(po, mo) for po, mo in files if force or not is_up_to_date(po, mo)]
+    if not pending:
+        return []
+
+    msgfmt = shutil.which("msgfmt")
+    if msgfmt is not None:
+        # msgfmt runs in its own process, so threads are enough to wait on it
+        fn = functools.partial(_compile_po_with_msgfmt, msgfmt)
+        executor: Executor = ThreadPoolExecutor(max_workers)
+    elif len(pending) == 1:
+        compile_po(*pending[0])
+        return [pending[0][1]]
+    else:
+        fn = compile_po
+        executor = ProcessPoolExecutor(max_workers)
+
+    with executor:
+        po_paths, mo_paths = zip(*pending)
+        # Consume the results so exceptions get propagated
+        for _ in executor.map(fn, po_paths, mo_paths):
+            pass
+
+    return [mo for _, mo in pending]
+
+
+class LazyTranslations(gettext.NullTranslations, ABC):
+    """A lazy alternative to :class:`gettext.GNUTranslations`.
+
+    Rather than decoding every message into a dictionary up front,
+    messages are looked up in their encoded form and only the ones
+    that are requested get decoded.
+
+    Subclasses must set ``_n`` to the number of messages, implement
+    the ``_find()``, ``_get_original()``, and ``_get_translation()``
+    methods, and then call ``_parse_metadata()``.
+
+    """
+
+    plural = staticmethod(lambda n: int(n != 1))
+
+    # Set by NullTranslations.__init__()
+    _info: dict[str, str]
+    _fallback: gettext.NullTranslations | None
+    _n: int
+
+    def messages(self) -> Iterator[tuple[str, str]]:
+        """Decodes and yields every original message with its translation.
+
+        The singular and plural IDs of a message, along with each of its
+        translated plural forms, are separated by NUL characters.
+
+        """
+        charset = self._charset or "ascii"
+        for i in range(self._n):
+            original = self._get_original(i).decode(charset)
+            translation = self._get_translation(i).decode(charset)
+            yield original, translation
+
+    # Parsing
+
+    @abstractmethod
+    def _find(self, key: bytes) -> int | None:
+        """Returns the index of the message whose (singular) ID matches key."""
+
+    @abstractmethod
+    def _get_original(self, i: int) -> bytes:
+        """Returns the encoded original message at the given index."""
+
+    @abstractmethod
+    def _get_translation(self, i: int) -> bytes:
+        """Returns the encoded translation at the given index."""
+
+    def _parse_metadata(self) -> None:
+        # The metadata is the translation of the empty string
+        i = self._find(b"")
+        if i is None:
+            return
+
+        # Same approach as gettext.GNUTranslations._parse()
+        lastk = None
+        for b_item in self._get_translation(i).split(b"\n"):
+            item = b_item.decode().strip()
+            if not item:
+                continue
+            if item.startswith("#-#-#-#-#") and item.endswith("#-#-#-#-#"):
+                continue
+
+            if ":" not in item:
+                if lastk:
+                    self._info[lastk] += "\n" + item
+                continue
+
+            k, v = item.split(":", 1)
+            k = k.strip().lower()
+            v = v.strip()
+            self._info[k] = v
+            lastk = k
+
+            if k == "content-type":
+                self._charset = v.split("charset=")[1]
+            elif k == "plural-forms":
+                plural = v.split(";")[1].split("plural=")[1]
+                self.plural = gettext.c2py(plural)
+
+    def _lookup(self, message: str) -> str | None:
+        charset = self._charset or "ascii"
+        i = self._find(message.encode(charset))
+        if i is None or b"\0" in self._get_original(i):
+            return None
+        return self._get_translation(i).decode(charset)
+
+    def _lookup_plural(self, msgid1: str, n: int) -> str | None:
+        charset = self._charset or "ascii"
+        i = self._find(msgid1.encode(charset))
+        if i is None or b"\0" not in self._get_original(i):
+            return None
+
+        forms = self._get_translation(i).split(b"\0")
+        index = self.plural(n)
+        if index >= len(forms):
+            return None
+        return forms[index].decode(charset)
+
+    # NullTranslations interface
+
+    def gettext(self, message: str) -> str:
+        tmsg = self._lookup(message)
+        if tmsg is not None:
+            return tmsg
+        if self._fallback:
+            return self._fallback.gettext(message)
+        return message
+
+    def ngettext(self, msgid1: str, msgid2: str, n: int) -> str:
+        tmsg = self._lookup_plural(msgid1, n)
+        if tmsg is not None:
+            return tmsg
+        if self._fallback:
+            return self._fallback.ngettext(msgid1, msgid2, n)
+        return msgid1 if n == 1 else msgid2
+
+    def pgettext(self, context: str, message: str) -> str:
+        tmsg = self._lookup(f"{context}\x04{message}")
+        if tmsg is not None:
+            return tmsg
+        if self._fallback:
+            return self._fallback.pgettext(context, message)
+        return message
+
+    def npgettext(self, context: str, msgid1: str, msgid2: str, n: int) -> str:
+        tmsg = self._lookup_plural(f"{context}\x04{msgid1}", n)
+        if tmsg is not None:
+            return tmsg
+        if self._fallback:
+            return self._fallback.npgettext(context, msgid1, msgid2, n)
+        return msgid1 if n == 1 else msgid2
+
+
+class MmapTranslations(LazyTranslations):
+    """Reads translations from a memory-mapped .mo file.
+
+    Messages are looked up using the file's hash table, or a binary search
+    if the file does not have one. Because the file's pages are shared
+    with the OS page cache, multiple processes reading the same catalog
+    do not each hold a private copy of it.
+
+    .. note::
+
+        The file must not be modified in place while it is mapped,
+        so updated catalogs should be written to a temporary file
+        and then renamed over the original.
+
+    """
+
+    def __init__(self, path: Path) -> None:
+        super().__init__()
+        self._path = path
+
+        with path.open("rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise OSError(0, "Bad magic number", str(path)) from None
+
+        try:
+            self._parse_header()
+            self._parse_metadata()
+        except BaseException:
+            self._map.close()
+            raise
+
+    def close(self) -> None:
+        """Unmaps the underlying file."""
+        self._map.close()
+
+    # Parsing
+
+    def _parse_header(self) -> None:
+        buf = self._map
+        if len(buf) < 28:
+            raise OSError(0, "Bad magic number", str(self._path))
+
+        (magic,) = struct.unpack_from("<I", buf, 0)
+        if magic == LE_MAGIC:
+            order = "<"
+        elif magic == BE_MAGIC:
+            order = ">"
+        else:
+            raise OSError(0, "Bad magic number", str(self._path))
+
+        version, n, orig_offset, trans_offset, hash_size, hash_offset = (
+            struct.unpack_from(f"{order}6I", buf, 4)
+        )
+        major_version = version >> 16
+        if major_version not in (0, 1):
+            raise OSError(0, f"Bad version number {major_version}", str(self._path))
+
+        self._order = order
+        self._n = n
+        self._orig_offset = orig_offset
+        self._trans_offset = trans_offset
+        self._hash_size = hash_size
+        self._hash_offset = hash_offset
+
+    def _get_original(self, i: int) -> bytes:
+        length, offset = struct.unpack_from(
+            f"{self._order}2I", self._map, self._orig_offset + 8 * i
+        )
+        return self._map[offset : offset + length]
+
+    def _get_translation(self, i: int) -> bytes:
+        length, offset = struct.unpack_from(
+            f"{self._order}2I", self._map, self._trans_offset + 8 * i
+        )
+        return self._map[offset : offset + length]
+
+    def _find(self, key: bytes) -> int | None:
+        if self._hash_size > 2:
+            return self._find_hashed(key)
+        return self._find_sorted(key)
+
+    def _find_hashed(self, key: bytes) -> int | None:
+        # Same probing sequence as GNU gettext's dcigettext.c
+        size = self._hash_size
+        hval = hash_string(key)
+        idx = hval % size
+        incr = 1 + hval % (size - 2)
+
+        while True:
+            (nstr,) = struct.unpack_from(
+                f"{self._order}I", self._map, self._hash_offset + 4 * idx
+            )
+            if nstr == 0:
+                return None
+
+            i = nstr - 1
+            if i < self._n and self._get_original(i).split(b"\0", 1)[0] == key:
+                return i
+
+            if idx >= size - incr:
+                idx -= size - incr
+            else:
+                idx += incr
+
+    def _find_sorted(self, key: bytes) -> int | None:
+        # Original strings are sorted, so a binary search can be used
+        lo, hi = 0, self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            original = self._get_original(mid).split(b"\0", 1)[0]
+            if original < key:
+                lo = mid + 1
+            elif original > key:
+                hi = mid
+            else:
+                return mid
+        return None
+
+
+def write_bundle(catalogs: Mapping[str, Mapping[bytes, bytes]]) -> bytes:
+    """Packs the encoded messages of several languages into a single bundle.
+
+    Identical strings are only stored once across all languages,
+    and the hash of every message ID is computed ahead of time.
+
+    :param catalogs:
+        A mapping of language names to their messages,
+        as returned by :func:`read_mo()`.
+
+    """
+    strings: dict[bytes, int] = {}
+
+    def intern(s: bytes) -> int:
+        index = strings.get(s)
+        if index is None:
+            index = strings[s] = len(strings)
+        return index
+
+    languages: list[tuple[int, list[tuple[int, int, int]]]] = []
+    for language, messages in sorted(catalogs.items()):
+        entries = [
+            (hash_string(original.split(b"\0", 1)[0]), intern(original), intern(tr))
+            for original, tr in messages.items()
+        ]
+        entries.sort(key=lambda e: (e[0], e[1]))
+        languages.append((intern(language.encode()), entries))
+
+    locales_offset = _BUNDLE_HEADER.size
+    entries_offset = locales_offset + _BUNDLE_LOCALE.size * len(languages)
+    strings_offset = entries_offset + sum(
+        _BUNDLE_ENTRY.size * len(entries) for _, entries in languages
+    )
+    data_offset = strings_offset + 8 * len(strings)
+
+    parts: list[bytes] = [
+        _BUNDLE_HEADER.pack(
+            BUNDLE_MAGIC,
+            BUNDLE_VERSION,
+            len(languages),
+            len(strings),
+            locales_offset,
+            strings_offset,
+        )
+    ]
+
+    offset = entries_offset
+    for name_index, entries in languages:
+        parts.append(_BUNDLE_LOCALE.pack(name_index, len(entries), offset))
+        offset += _BUNDLE_ENTRY.size * len(entries)
+
+    for _, entries in languages:
+        parts.extend(_BUNDLE_ENTRY.pack(*entry) for entry in entries)
+
+    offset = data_offset
+    for s in strings:
+        parts.append(struct.pack("<2I", len(s), offset))
+        offset += len(s) + 1
+
+    parts.extend(s + b"\0" for s in strings)
+    return b"".join(parts)
+
+
+def bundle_mo_files(mo_paths: Iterable[Path]) -> list[Path]:
+    """Packs compiled .mo files into bundles next to their locale directories.
+
+    Each file is expected to be located at
+    ``<localedir>/<language>/LC_MESSAGES/<domain>.mo``, and is packed into
+    ``<localedir>/<domain>.bundle``. Bundles are written to a temporary
+    file first and then renamed, so they can be safely replaced while
+    another process has them memory-mapped.
+
+    :returns: The paths of each bundle that was written.
+
+    """
+    bundles: dict[Path, dict[str, dict[bytes, bytes]]] = {}
+    for path in mo_paths:
+        bundle_path = path.parents[2] / f"{path.stem}.bundle"
+        catalogs = bundles.setdefault(bundle_path, {})
+        catalogs[path.parents[1].name] = read_mo(path.read_bytes())
+
+    for bundle_path, catalogs in bundles.items():
+        temp = bundle_path.with_name(bundle_path.name + ".tmp")
+        temp.write_bytes(write_bundle(catalogs))
+        os.replace(temp, bundle_path)
+
+    return list(bundles)
+
+
+def read_bundle(buffer: Buffer) -> dict[str, BundleTranslations]:
+    """Reads every language stored in a bundle.
+
+    The returned translations share the given buffer,
+    which can be the bundle's contents or a memory map of it.
+
+    :raises OSError: The buffer is not a valid bundle.
+
+    """
+    if len(buffer) < _BUNDLE_HEADER.size:
+        raise OSError(0, "Bad magic number")
+
+    magic, version, n_languages, _, locales_offset, strings_offset = (
+        _BUNDLE_HEADER.unpack_from(buffer, 0)
+    )
+    if magic != BUNDLE_MAGIC:
+        raise OSError(0, "Bad magic number")
+    elif version != BUNDLE_VERSION:
+        raise OSError(0, f"Bad version number {version}")
+
+    catalogs: dict[str, BundleTranslations] = {}
+    for i in range(n_languages):
+        name_index, n, entries_offset = _BUNDLE_LOCALE.unpack_from(
+            buffer, locales_offset + _BUNDLE_LOCALE.size * i
+        )
+        t = BundleTranslations(buffer, n, entries_offset, strings_offset)
+        catalogs[t._get_string(name_index).decode()] = t
+    return catalogs
+
+
+def open_bundle(path: Path, *, use_mmap: bool = False) -> dict[str, BundleTranslations]:
+    """Opens a bundle file and reads every language stored in it.
+
+    :param path: The path to the bundle.
+    :param use_mmap:
+        If True, the bundle is memory-mapped instead of read into memory.
+        See :class:`MmapTranslations` for the caveats of this.
+    :raises OSError: The file could not be opened or is not a valid bundle.
+
+    """
+    with path.open("rb") as f:
+        if not use_mmap:
+            return read_bundle(f.read())
+
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise OSError(0, "Bad magic number", str(path)) from None
+        return read_bundle(buffer)
+
+
+class BundleTranslations(LazyTranslations):
+    """Reads the translations of one language from a bundle.
+
+    Instances should be created with :func:`read_bundle()`
+    or :func:`open_bundle()`.
+
+    """
+
+    def __init__(
+        self,
+        buffer: Buffer,
+        n: int,
+        entries_offset: int,
+        strings_offset: int,
+    ) -> None:
+        super().__init__()
+        self._buffer = buffer
+        self._n = n
+        self._entries_offset = entries_offset
+        self._strings_offset = strings_offset
+        self._parse_metadata()
+
+    def _get_string(self, index: int) -> bytes:
+        length, offset = struct.unpack_from(
+            "<2I", self._buffer, self._strings_offset + 8 * index
+        )
+        return self._buffer[offset : offset + length]
+
+    def _get_entry(self, i: int) -> tuple[int, int, int]:
+        return _BUNDLE_ENTRY.unpack_from(
+            self._buffer, self._entries_offset + _BUNDLE_ENTRY.size * i
+        )
+
+    def _get_original(self, i: int) -> bytes:
+        return self._get_string(self._get_entry(i)[1])
+
+    def _get_translation(self, i: int) -> bytes:
+        return self._get_string(self._get_entry(i)[2])
+
+    def _find(self, key: bytes) -> int | None:
+        # Entries are sorted by hash, so find the first one with the same hash
+        # and compare each message ID until the hash differs
+        hval = hash_string(key)
+        lo, hi = 0, self._n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._get_entry(mid)[0] < hval:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        for i in range(lo, self._n):
+            entry_hash, original_index, _ = self._get_entry(i)
+            if entry_hash != hval:
+                break
+            if self._get_string(original_index).split(b"\0", 1)[0] == key:
+                return i
+        return None
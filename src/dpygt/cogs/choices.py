@@ -4,7 +4,7 @@ from discord.app_commands import locale_str as _
 from discord.ext import commands
 
 from dpygt.bot import DPyGT
-from dpygt.translator import translate
+from dpygt.translator import translate_template
 
 
 class Choices(commands.Cog):
@@ -40,10 +40,12 @@ class Choices(commands.Cog):
         interaction: discord.Interaction,
         fruit: app_commands.Choice[int],
     ):
-        # Message telling the user their favourite fruit
-        message = await translate(_("Your favourite fruit is {}!"), interaction)
-        message = message.format(fruit)
-        await interaction.response.send_message(message)
+        message = await translate_template(
+            # Message telling the user their favourite fruit
+            _("Your favourite fruit is {}!"),
+            interaction,
+        )
+        await interaction.response.send_message(message.format(fruit))
 
 
 async def setup(bot: DPyGT):
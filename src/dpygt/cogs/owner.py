@@ -1,9 +1,13 @@
+import io
+
 import discord
 from discord import app_commands
 from discord.ext import commands
 
 from dpygt.bot import Context, DPyGT
 from dpygt.config import load_config
+from dpygt.sync import SyncState, diff_digests, get_command_payload, get_payload_digests
+from dpygt.translator import GettextTranslator
 
 
 def count_localizations(command: app_commands.AppCommand) -> int:
@@ -28,30 +32,106 @@ def count_localizations(command: app_commands.AppCommand) -> int:
 class Owner(commands.Cog):
     def __init__(self, bot: DPyGT):
         self.bot = bot
+        self.sync_state = SyncState()
 
     async def cog_check(self, ctx: Context) -> bool:  # type: ignore
         return await commands.is_owner().predicate(ctx)
 
     @commands.command(name="reload-config", aliases=["config-reload"])
     async def reload_config(self, ctx: Context):
-        """Reload the bot's configuration."""
-        self.bot.config = load_config()
-        await ctx.reply("Config reloaded!")
+        """Reload the bot's configuration and apply any changes."""
+        diff, errors = await self.bot.apply_config(load_config())
+        if not diff:
+            return await ctx.reply("Config reloaded, nothing has changed!")
+
+        content = f"Config reloaded!\n{diff.describe()}"
+        for name, error in errors.items():
+            content += f"\nFailed to apply {name}: {error}"
+        if diff.requires_reconnect:
+            names = ", ".join(diff.requires_reconnect)
+            content += f"\nThese changes require a reconnect to take effect: {names}"
+        if diff.requires_extension_reload:
+            names = ", ".join(diff.requires_extension_reload)
+            content += (
+                f"\nThese changes require reloading extensions to take effect: {names}"
+            )
+        await ctx.reply(content)
+
+    @commands.command(name="reload-translations", aliases=["translations-reload"])
+    async def reload_translations(self, ctx: Context):
+        """Reload any compiled translation catalogs that have changed."""
+        translator = ctx.bot.tree.translator
+        if not isinstance(translator, GettextTranslator):
+            return await ctx.reply("No gettext translator is currently set!")
+
+        changed = await translator.reload()
+        if not changed:
+            return await ctx.reply("No catalogs have changed!")
+
+        await translator.build_localization_table(ctx.bot.tree)
+
+        await ctx.reply(f"{len(changed)} catalog(s) reloaded!")
+
+    @commands.command(name="metrics")
+    async def metrics(self, ctx: Context, prefix: str = ""):
+        """Show the metrics collected since the bot started.
+
+        Only metrics whose names start with the given prefix are shown.
+
+        """
+        content = ctx.bot.metrics.dump(prefix)
+        if not content:
+            return await ctx.reply("No metrics have been collected yet!")
+
+        content = f"```\n{content}\n```"
+        if len(content) <= 2000:
+            return await ctx.reply(content)
+
+        file = discord.File(io.BytesIO(content.encode()), filename="metrics.txt")
+        await ctx.reply(file=file)
 
     @commands.command(name="sync")
-    async def sync(self, ctx: Context, guild_id: int | None = None):
-        """Synchronize the bot's application commands."""
+    async def sync(
+        self,
+        ctx: Context,
+        guild_id: int | None = None,
+        force: bool = False,
+    ):
+        """Synchronize the bot's application commands.
+
+        Synchronization is skipped if the localized commands have not
+        changed since they were last synchronized, unless forced.
+
+        """
         guild: discord.Object | None = None
         if guild_id is not None:
             guild = discord.Object(guild_id)
 
+        # Deferred extensions must be loaded so their commands aren't removed
+        await ctx.bot.load_lazy_extensions()
+
+        assert ctx.bot.application_id is not None
+        payload = await get_command_payload(ctx.bot.tree, guild)
+        digests = get_payload_digests(payload)
+        diff = diff_digests(
+            self.sync_state.get(ctx.bot.application_id, guild),
+            digests,
+        )
+        if not diff and not force:
+            return await ctx.send("No changes to synchronize!")
+
         commands = await ctx.bot.tree.sync(guild=guild)
+        self.sync_state.set(ctx.bot.application_id, guild, digests)
+
         n_commands = len(commands)
         n_localizations = sum(map(count_localizations, commands))
-        await ctx.send(
+        content = (
             f"{n_commands} command(s) synchronized "
             f"with a total of {n_localizations} localizations!"
         )
+        if diff:
+            content += "\n" + diff.describe()
+        await ctx.send(content)
 
 
 async def setup(bot: DPyGT):
@@ -6,7 +6,7 @@ from discord.app_commands import locale_str as _
 from discord.ext import commands
 
 from dpygt.bot import DPyGT
-from dpygt.translator import translate
+from dpygt.translator import translate_template
 
 
 class Random(commands.Cog):
@@ -40,13 +40,15 @@ class Random(commands.Cog):
         rolls = [random.randint(1, n_sides) for _ in range(n_dice)]
         rolls_str = ", ".join(map(str, rolls))
 
-        # Message sent after one or more dice have been rolled
-        # {0}: a comma-separated list of each die's values
-        # {1}: the total value of rolled dice
-        message = await translate(_("Rolls: [{0}]\nTotal: {1}"), interaction)
-        message = message.format(rolls_str, sum(rolls))
+        message = await translate_template(
+            # Message sent after one or more dice have been rolled
+            # {0}: a comma-separated list of each die's values
+            # {1}: the total value of rolled dice
+            _("Rolls: [{0}]\nTotal: {1}"),
+            interaction,
+        )
 
-        await interaction.response.send_message(message)
+        await interaction.response.send_message(message.format(rolls_str, sum(rolls)))
 
 
 async def setup(bot: DPyGT):
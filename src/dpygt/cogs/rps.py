@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import asyncio
 import datetime
+import logging
+import time
 from abc import ABC, abstractmethod
-from typing import Iterable
+from pathlib import Path
+from typing import Any, ClassVar, Generic, Iterable, NamedTuple, Sequence, TypeVar
 
 import discord
 from discord import app_commands
@@ -11,72 +14,255 @@ from discord.app_commands import locale_str as _
 from discord.ext import commands
 
 from dpygt.bot import DPyGT
-from dpygt.translator import plural_locale_str as ngettext, translate
+from dpygt.games import GameStore, RPSGameRecord
+from dpygt.scheduler import ExpiryScheduler
+from dpygt.template import compile_template
+from dpygt.translator import (
+    plural_locale_str as ngettext,
+    translate,
+    translate_many,
+    translate_template,
+)
 
-UM = discord.User | discord.Member
+# Games are persisted and their views must be registered at startup
+# to receive button presses, so this extension can't be loaded lazily
+LAZY = False
+
+# The moves of players, which may be None if a variant lets players join
+# before picking a move
+M = TypeVar("M", bound="RPSButton | None")
+
+log = logging.getLogger(__name__)
+
+
+def beats(a: int, b: int, n: int) -> bool:
+    """Checks if move ``a`` beats move ``b`` in a cycle of ``n`` moves.
+
+    For an odd number of moves, each move beats the ``(n - 1) / 2`` moves
+    that follow it in the cycle and loses to the rest, e.g. rock, paper,
+    scissors, lizard, Spock.
+
+    """
+    return 0 < (b - a) % n <= n // 2
+
+
+def get_winning_moves(counts: Sequence[int]) -> list[int]:
+    """Returns the moves that won given the number of times each move was played.
+
+    A move wins if it beats at least one move that was played
+    and no move that was played beats it. Nobody wins if every move
+    was countered or only one kind of move was played.
+
+    """
+    n = len(counts)
+    played = [move for move, count in enumerate(counts) if count]
+    return [
+        a
+        for a in played
+        if not any(beats(b, a, n) for b in played)
+        and any(beats(a, b, n) for b in played)
+    ]
 
 
 class RPSButton(discord.ui.Button["BaseRPSView"]):
-    """Represents one of rock, paper, or scissors.
+    """Represents one of the moves in Rock, Paper, Scissors.
 
-    The given value determines if it beats the next option.
+    The given value determines which moves it beats, see :func:`beats()`.
 
     """
 
     def __init__(self, value: int, *args, **kwargs):
+        # A stable custom ID lets the button keep working after restarting
+        kwargs.setdefault("custom_id", f"dpygt:rps:{value}")
         super().__init__(*args, **kwargs)
         self.value = value
 
     def beats(self, other: RPSButton) -> bool:
         assert self.view is not None
-        return (self.value + 1) % len(self.view.children) == other.value
+        return beats(self.value, other.value, len(self.view.children))
 
     async def callback(self, interaction: discord.Interaction):
         assert self.view is not None
+        if not self.view.saved or self.view.is_finished():
+            # The game hasn't been set up yet, or it has already ended
+            return
         await self.view.step(interaction, self)
 
 
-class BaseRPSView(discord.ui.View, ABC):
-    """Defines the interface for any Rock, Paper, Scissors variant."""
+class BaseRPSView(discord.ui.View, ABC, Generic[M]):
+    """Defines the interface for any Rock, Paper, Scissors variant.
+
+    Views are persistent and save their state to the cog's :class:`GameStore`,
+    so games can be resumed with :meth:`from_record()` after restarting.
+    Players are identified by their user IDs.
+
+    :param cog: The cog that owns this game.
+    :param locale: The locale used to display the game.
+    :param buttons: The moves that players can pick from.
+    :param timeout: The seconds of inactivity before the game ends.
+    :param moveset: The name of the moveset that the buttons were created from.
+
+    """
 
     children: list[RPSButton]  # type: ignore
-    message: discord.Message
+    message: discord.PartialMessage
+    moves: dict[int, M]
+    variant: ClassVar[str]
+    # Seconds to wait before revealing the winner
+    reveal_delay = 2.0
 
     def __init__(
         self,
-        interaction: discord.Interaction,
+        cog: RPS,
+        locale: discord.Locale,
         buttons: Iterable[RPSButton],
-        *args,
-        **kwargs,
+        *,
+        timeout: float,
+        moveset: str = "standard",
     ):
-        super().__init__(*args, **kwargs)
+        # Persistent views can't time out, so the cog's scheduler expires games instead
+        super().__init__(timeout=None)
         for button in buttons:
             self.add_item(button)
-        self.interaction = interaction
+        self.cog = cog
+        self.locale = locale
+        self.moveset = moveset
+        self.inactivity_timeout = timeout
+        self.expires_at = time.time() + timeout
+        # Set once the game has been added to the store
+        self.saved = False
+
+    @classmethod
+    @abstractmethod
+    def from_record(
+        cls,
+        cog: RPS,
+        record: RPSGameRecord,
+        buttons: Iterable[RPSButton],
+    ) -> BaseRPSView:
+        """Recreates a game from its saved state."""
+
+    def _restore(self, record: RPSGameRecord) -> None:
+        # Shared by from_record() implementations
+        self.expires_at = record.expires_at
+        self.saved = True
+        self._set_message(record.channel_id, record.message_id)
+
+    def _set_message(self, channel_id: int, message_id: int) -> None:
+        # Edited with the bot's token, since interaction tokens expire
+        # after 15 minutes and games can last longer than that
+        self.message = self.cog.bot.get_partial_messageable(
+            channel_id
+        ).get_partial_message(message_id)
 
-    @property
-    def timeout_timestamp(self) -> str | None:
-        if self.timeout is None:
+    @abstractmethod
+    def to_record(self) -> RPSGameRecord:
+        """Returns the state of the game to be saved."""
+
+    def get_base_embed(self) -> discord.Embed:
+        return discord.Embed()
+
+    def list_moves(self, *, reveal: bool) -> list[str]:
+        move_list: list[str] = []
+        for player, button in self.moves.items():
+            move = "⬛"
+            if button is None:
+                move = "🤔"
+            elif reveal:
+                move = button.emoji
+            move_list.append(f"{move} <@{player}>")
+        return move_list
+
+    async def save_move(self, user_id: int, position: int, button: RPSButton) -> None:
+        """Saves a player's move and extends the game's expiry time.
+
+        :param user_id: The player that made the move.
+        :param position: The order in which the player joined the game.
+        :param button: The move they picked.
+
+        """
+        if not self.saved or self.cog.views.get(self.message.id) is not self:
+            # The game ended or expired, and may be gone from the store
             return
-        ends = datetime.datetime.now() + datetime.timedelta(seconds=self.timeout)
+
+        self.expires_at = time.time() + self.inactivity_timeout
+        self.cog.expiry.schedule(self.message.id, self.expires_at)
+        await self.cog.store.set_rps_move(
+            self.message.id,
+            position,
+            user_id,
+            button.value,
+            self.expires_at,
+        )
+
+    async def reveal(
+        self, interaction: discord.Interaction, final_embed: discord.Embed
+    ):
+        """Ends the game and reveals the winner after :attr:`reveal_delay`.
+
+        The final embed is sent later so the callback isn't held up.
+
+        """
+        for button in self.children:
+            button.disabled = True
+
+        pause_embed = self.get_base_embed()
+        # Message temporarily shown before the winner is revealed
+        reveal_message_key = _("Revealing the winner...")
+        reveal_message = await translate(reveal_message_key, self.cog.bot, self.locale)
+        pause_embed.description = "\n".join(
+            [reveal_message] + self.list_moves(reveal=False)
+        )
+        await self.update(interaction, embed=pause_embed)
+
+        assert interaction.message is not None
+        self.cog.schedule_edit(
+            interaction,
+            interaction.message.id,
+            self.reveal_delay,
+            embed=final_embed,
+        )
+
+    @property
+    def timeout_timestamp(self) -> str:
+        ends = datetime.datetime.fromtimestamp(self.expires_at)
         return discord.utils.format_dt(ends, style="R")
 
+    async def end(self) -> None:
+        """Stops listening for moves and removes the game from the store."""
+        self.stop()
+        self.cog.remove_game(self.message.id)
+        await self.cog.store.remove_rps_game(self.message.id)
+
     async def on_timeout(self):
+        """Shows that the game ended from inactivity.
+
+        This is called by the cog after the game has been stopped.
+
+        """
         for button in self.children:
             button.disabled = True
-        timestamp = discord.utils.format_dt(datetime.datetime.now(), style="R")
-        # Message shown when the Rock Paper Scissors game times out
-        # {0}: the time when the game ended, e.g. 10 minutes ago (formatted by Discord)
-        content = await translate(_("(ended {0} from inactivity)"), self.interaction)
-        content = content.format(timestamp)
-        await self.message.edit(content=content, view=self)
+
+        ends = datetime.datetime.fromtimestamp(self.expires_at)
+        timestamp = discord.utils.format_dt(ends, style="R")
+        template = await translate_template(
+            # Message shown when the Rock Paper Scissors game times out
+            # {0}: the time when the game ended, e.g. 10 minutes ago (formatted by Discord)
+            _("(ended {0} from inactivity)"),
+            self.cog.bot,
+            self.locale,
+        )
+        try:
+            await self.message.edit(content=template.format(timestamp), view=self)
+        except discord.HTTPException:
+            log.warning("Failed to edit expired game %d", self.message.id)
 
     @abstractmethod
-    def get_winners(self) -> list[UM] | None:
-        """Returns the winners of the game."""
+    def get_winners(self) -> list[int] | None:
+        """Returns the user IDs of the winners of the game."""
 
     @abstractmethod
-    async def get_embed(self, winners: list[UM] | None) -> discord.Embed:
+    async def get_embed(self, winners: list[int] | None) -> discord.Embed:
         """Returns the embed used for displaying the game's state."""
 
     @abstractmethod
@@ -84,22 +270,33 @@ class BaseRPSView(discord.ui.View, ABC):
         """Triggered after a move has been submitted."""
 
     async def update(self, interaction: discord.Interaction, **kwargs):
-        """Edits the game message with the current view."""
+        """Edits the game message with the current view.
+
+        Edits made shortly after another are combined into one edit
+        that is sent later, see :meth:`RPS.coalesce_edit()`.
+
+        """
         finished = all(b.disabled for b in self.children)
 
-        content: str | None = None
-        timestamp = self.timeout_timestamp
-        if not finished and timestamp is not None:
+        if not finished:
             # Message shown while the Rock Paper Scissors game is active
             # {0}: the time that the game will end, e.g. in 10 minutes (formatted by Discord)
-            content = await translate(_("(ends {0})"), self.interaction)
-            content = content.format(timestamp)
-
-        if content is not None:
-            kwargs["content"] = content
+            ends_key = _("(ends {0})")
+            template = await translate_template(ends_key, self.cog.bot, self.locale)
+            kwargs["content"] = template.format(self.timeout_timestamp)
 
         kwargs["view"] = self
 
+        assert interaction.message is not None
+        message_id = interaction.message.id
+        if finished:
+            # The final state replaces any pending edit and is sent right away
+            self.cog.cancel_edit(message_id)
+        elif self.cog.coalesce_edit(interaction, message_id, **kwargs):
+            if not interaction.response.is_done():
+                await interaction.response.defer()
+            return
+
         try:
             if interaction.response.is_done():
                 await interaction.edit_original_response(**kwargs)
@@ -109,42 +306,91 @@ class BaseRPSView(discord.ui.View, ABC):
             pass
         else:
             if finished:
-                self.stop()
+                await self.end()
 
-    async def start(self, *, wait=True):
-        """Starts the game."""
+    async def start(self, interaction: discord.Interaction, *, wait=True):
+        """Sends the game in response to an interaction and saves it."""
         embed = await self.get_embed(self.get_winners())
 
-        content = ""
-        timestamp = self.timeout_timestamp
-        if timestamp is not None:
-            content = await translate(_("(ends {0})"), self.interaction)
-            content = content.format(timestamp)
+        template = await translate_template(_("(ends {0})"), self.cog.bot, self.locale)
+        content = template.format(self.timeout_timestamp)
+
+        response = await interaction.response.send_message(
+            content, embed=embed, view=self
+        )
+        assert interaction.channel_id is not None
+        assert response.message_id is not None
+        self._set_message(interaction.channel_id, response.message_id)
+        if self.is_finished():
+            return
 
-        await self.interaction.response.send_message(content, embed=embed, view=self)
-        self.message = await self.interaction.original_response()
+        # Moves are ignored until the game is saved, so there is
+        # no await before it's tracked and the record is complete
+        self.saved = True
+        self.cog.add_game(self)
+        await self.cog.store.add_rps_game(self.to_record())
 
         if wait:
             await self.wait()
 
 
-class RPSDuelView(BaseRPSView):
+class RPSDuelView(BaseRPSView[RPSButton | None]):
     """A typical variant of RPS with two players."""
 
-    moves: dict[UM, RPSButton | None]
+    variant = "duel"
 
     def __init__(
         self,
-        interaction: discord.Interaction,
+        cog: RPS,
+        locale: discord.Locale,
         buttons: Iterable[RPSButton],
-        players: set[UM],
-        *args,
-        **kwargs,
+        players: set[int],
+        *,
+        timeout: float,
+        moveset: str = "standard",
     ):
-        super().__init__(interaction, buttons, *args, **kwargs)
+        super().__init__(cog, locale, buttons, timeout=timeout, moveset=moveset)
         self.players = players
         self.moves = {p: None for p in players}
 
+    @classmethod
+    def from_record(
+        cls,
+        cog: RPS,
+        record: RPSGameRecord,
+        buttons: Iterable[RPSButton],
+    ) -> RPSDuelView:
+        players = set() if record.public else {p for p, _ in record.players}
+        view = cls(
+            cog,
+            discord.Locale(record.locale),
+            buttons,
+            players,
+            timeout=cog.bot.config.rps.timeout,
+            moveset=record.moveset,
+        )
+        values = {b.value: b for b in view.children}
+        view.moves = {
+            p: values[move] if move is not None else None for p, move in record.players
+        }
+        view._restore(record)
+        return view
+
+    def to_record(self) -> RPSGameRecord:
+        return RPSGameRecord(
+            message_id=self.message.id,
+            channel_id=self.message.channel.id,
+            variant=self.variant,
+            locale=self.locale.value,
+            public=self.public,
+            expires_at=self.expires_at,
+            max_players=2,
+            moveset=self.moveset,
+            players=[
+                (p, b.value if b is not None else None) for p, b in self.moves.items()
+            ],
+        )
+
     @property
     def public(self) -> bool:
         """Indicates if anyone can join this game."""
@@ -164,7 +410,7 @@ class RPSDuelView(BaseRPSView):
         if interaction.user.bot:
             return False
         # Check if they made a move already
-        move = self.moves.get(interaction.user)
+        move = self.moves.get(interaction.user.id)
         if move is not None:
             return False
         elif self.public:
@@ -172,9 +418,9 @@ class RPSDuelView(BaseRPSView):
             return self.n_waiting > 0
         else:
             # Check if they are part of the game
-            return interaction.user in self.players
+            return interaction.user.id in self.players
 
-    def get_winners(self) -> list[UM] | None:
+    def get_winners(self) -> list[int] | None:
         if any(m is None for m in self.moves.values()):
             return None
         elif self.public and len(self.moves) < 2:
@@ -191,45 +437,37 @@ class RPSDuelView(BaseRPSView):
 
         return []
 
-    def get_base_embed(self) -> discord.Embed:
-        return discord.Embed()
-
-    def list_moves(self, *, reveal: bool) -> list[str]:
-        move_list: list[str] = []
-        for player, button in self.moves.items():
-            move = "⬛"
-            if button is None:
-                move = "🤔"
-            elif reveal:
-                move = button.emoji
-            move_list.append(f"{move} {player.mention}")
-        return move_list
+    async def get_embed(self, winners: list[int] | None) -> discord.Embed:
+        n = self.n_waiting
+        winner_message, tie_message, waiting_message = await translate_many(
+            [
+                # Message shown when someone wins in Rock Paper Scissors
+                # {0}: the user's mention, e.g. @thegamecracks
+                _("The winner is {0}!"),
+                # Message shown when game ends due to a tie in Rock Paper Scissors
+                _("It's a tie!"),
+                (
+                    # Message shown when a player needs to join the current game
+                    ngettext("Waiting for {0} player...", "Waiting for {0} players..."),
+                    n,
+                ),
+            ],
+            self.cog.bot,
+            self.locale,
+        )
 
-    async def get_embed(self, winners: list[UM] | None) -> discord.Embed:
         description: list[str] = []
 
         if winners:
-            # Message shown when someone wins in Rock Paper Scissors
-            # {0}: the user's mention, e.g. @thegamecracks
-            content = await translate(_("The winner is {0}!"), self.interaction)
-            content = content.format(winners[0].mention)
-            description.append(content)
+            template = compile_template(winner_message)
+            description.append(template.format(f"<@{winners[0]}>"))
         elif winners is not None:
-            # Message shown when game ends due to a tie in Rock Paper Scissors
-            description.append(await translate(_("It's a tie!"), self.interaction))
+            description.append(tie_message)
 
         description.extend(self.list_moves(reveal=winners is not None))
 
-        n = self.n_waiting
         if len(self.moves) < 2 and n:
-            content = await translate(
-                # Message shown when a player needs to join the current game
-                ngettext("Waiting for {0} player...", "Waiting for {0} players..."),
-                self.interaction,
-                data=n,
-            )
-            content = content.format(n)
-            description.append(content)
+            description.append(compile_template(waiting_message).format(n))
 
         embed = self.get_base_embed()
         embed.description = "\n".join(description)
@@ -237,26 +475,171 @@ class RPSDuelView(BaseRPSView):
         return embed
 
     async def step(self, interaction: discord.Interaction, button: RPSButton):
-        self.moves[interaction.user] = button
+        user_id = interaction.user.id
+        self.moves[user_id] = button
+        await self.save_move(user_id, list(self.moves).index(user_id), button)
 
         winners = self.get_winners()
         final_embed = await self.get_embed(winners)
 
         if winners is not None:
-            for button in self.children:
-                button.disabled = True
+            await self.reveal(interaction, final_embed)
+        else:
+            await self.update(interaction, embed=final_embed)
+
 
-            pause_embed = self.get_base_embed()
-            # Message temporarily shown before the winner is revealed
-            reveal_message_key = _("Revealing the winner...")
-            reveal_message = await translate(reveal_message_key, self.interaction)
-            pause_embed.description = "\n".join(
-                [reveal_message] + self.list_moves(reveal=False)
-            )
-            await self.update(interaction, embed=pause_embed)
-            await asyncio.sleep(2)
+class RPSLobbyView(BaseRPSView[RPSButton]):
+    """A variant of RPS where anyone can join until the lobby is full.
 
-        await self.update(interaction, embed=final_embed)
+    Winners are found by counting how many times each move was played,
+    so resolving a game takes a single pass over its players regardless
+    of the size of the lobby or the number of moves.
+
+    :param max_players: The number of moves needed to end the game.
+
+    """
+
+    variant = "lobby"
+
+    def __init__(
+        self,
+        cog: RPS,
+        locale: discord.Locale,
+        buttons: Iterable[RPSButton],
+        max_players: int,
+        *,
+        timeout: float,
+        moveset: str = "standard",
+    ):
+        super().__init__(cog, locale, buttons, timeout=timeout, moveset=moveset)
+        self.max_players = max_players
+        self.moves = {}
+        # Updated with each move so checks don't need to look at every player
+        self.counts = [0] * len(self.children)
+        self.n_ready = 0
+
+    @classmethod
+    def from_record(
+        cls,
+        cog: RPS,
+        record: RPSGameRecord,
+        buttons: Iterable[RPSButton],
+    ) -> RPSLobbyView:
+        view = cls(
+            cog,
+            discord.Locale(record.locale),
+            buttons,
+            record.max_players,
+            timeout=cog.bot.config.rps.timeout,
+            moveset=record.moveset,
+        )
+        values = {b.value: b for b in view.children}
+        for user_id, move in record.players:
+            if move is not None:
+                view.add_move(user_id, values[move])
+        view._restore(record)
+        return view
+
+    def to_record(self) -> RPSGameRecord:
+        return RPSGameRecord(
+            message_id=self.message.id,
+            channel_id=self.message.channel.id,
+            variant=self.variant,
+            locale=self.locale.value,
+            public=True,
+            expires_at=self.expires_at,
+            max_players=self.max_players,
+            moveset=self.moveset,
+            players=[(p, b.value) for p, b in self.moves.items()],
+        )
+
+    @property
+    def n_waiting(self) -> int:
+        """Indicates the number of players that still need to join."""
+        return self.max_players - self.n_ready
+
+    def add_move(self, user_id: int, button: RPSButton) -> int:
+        """Adds a player to the game with their move.
+
+        :returns: The position of the player in the game.
+
+        """
+        self.moves[user_id] = button
+        self.counts[button.value] += 1
+        self.n_ready += 1
+        return self.n_ready - 1
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        if interaction.user.bot:
+            return False
+        return interaction.user.id not in self.moves and self.n_waiting > 0
+
+    def get_winners(self) -> list[int] | None:
+        if self.n_waiting > 0:
+            return None
+
+        winning = set(get_winning_moves(self.counts))
+        if not winning:
+            return []
+        return [p for p, b in self.moves.items() if b.value in winning]
+
+    async def get_embed(self, winners: list[int] | None) -> discord.Embed:
+        n_winners = len(winners) if winners else 0
+        n = self.n_waiting
+        winners_message, tie_message, waiting_message = await translate_many(
+            [
+                (
+                    # Message shown when one or more players win in Rock Paper Scissors
+                    # {0}: the number of winners
+                    ngettext("{0} player won!", "{0} players won!"),
+                    n_winners,
+                ),
+                _("It's a tie!"),
+                (
+                    ngettext("Waiting for {0} player...", "Waiting for {0} players..."),
+                    n,
+                ),
+            ],
+            self.cog.bot,
+            self.locale,
+        )
+
+        description: list[str] = []
+
+        if winners:
+            description.append(compile_template(winners_message).format(n_winners))
+        elif winners is not None:
+            description.append(tie_message)
+
+        description.extend(self.list_moves(reveal=winners is not None))
+
+        if n:
+            description.append(compile_template(waiting_message).format(n))
+
+        embed = self.get_base_embed()
+        embed.description = "\n".join(description)
+
+        return embed
+
+    async def step(self, interaction: discord.Interaction, button: RPSButton):
+        user_id = interaction.user.id
+        position = self.add_move(user_id, button)
+        await self.save_move(user_id, position, button)
+
+        winners = self.get_winners()
+        final_embed = await self.get_embed(winners)
+
+        if winners is not None:
+            await self.reveal(interaction, final_embed)
+        else:
+            await self.update(interaction, embed=final_embed)
+
+
+class PendingEdit(NamedTuple):
+    """An edit to a game message that will be sent later."""
+
+    interaction: discord.Interaction
+    kwargs: dict[str, Any]
 
 
 def _create_buttons(*items: tuple[int, dict[str, object]]) -> tuple[RPSButton, ...]:
@@ -269,9 +652,206 @@ class RPS(commands.Cog):
         (1, {"emoji": "📰", "style": discord.ButtonStyle.primary}),
         (0, {"emoji": "✂️", "style": discord.ButtonStyle.primary}),
     )
+    # Rock, paper, scissors, lizard, Spock, ordered so each move
+    # beats the two that follow it in the cycle
+    EXTENDED = (
+        (2, {"emoji": "🪨", "style": discord.ButtonStyle.primary}),
+        (0, {"emoji": "📰", "style": discord.ButtonStyle.primary}),
+        (3, {"emoji": "✂️", "style": discord.ButtonStyle.primary}),
+        (4, {"emoji": "🦎", "style": discord.ButtonStyle.primary}),
+        (1, {"emoji": "🖖", "style": discord.ButtonStyle.primary}),
+    )
+
+    MOVESETS = {
+        "standard": STANDARD,
+        "extended": EXTENDED,
+    }
+    VARIANTS: dict[str, type[BaseRPSView]] = {
+        RPSDuelView.variant: RPSDuelView,
+        RPSLobbyView.variant: RPSLobbyView,
+    }
 
     def __init__(self, bot: DPyGT):
         self.bot = bot
+        self.store = GameStore(Path(bot.config.rps.database))
+        # Active games by their message ID
+        self.views: dict[int, BaseRPSView] = {}
+        # One task expires every game, rather than a timer for each view
+        self.expiry: ExpiryScheduler[int] = ExpiryScheduler(self._expire_games)
+        self._expired_views: asyncio.Queue[BaseRPSView] = asyncio.Queue()
+        self._edit_task: asyncio.Task | None = None
+        # Delayed edits by message ID, sent in batches by another scheduler
+        self._pending_edits: dict[int, PendingEdit] = {}
+        # When each active game's message was last edited
+        self._last_edits: dict[int, float] = {}
+        self.edits: ExpiryScheduler[int] = ExpiryScheduler(
+            self._send_pending_edits,
+            batch_window=0.1,
+        )
+
+    def add_game(self, view: BaseRPSView) -> None:
+        """Tracks an active game and schedules it to expire."""
+        self.views[view.message.id] = view
+        self.expiry.schedule(view.message.id, view.expires_at)
+        self.bot.metrics.set("rps_live_games", len(self.views))
+
+    def remove_game(self, message_id: int) -> None:
+        """Stops tracking a game that has ended."""
+        self.views.pop(message_id, None)
+        self.expiry.cancel(message_id)
+        self._last_edits.pop(message_id, None)
+        self.bot.metrics.set("rps_live_games", len(self.views))
+
+    def schedule_edit(
+        self,
+        interaction: discord.Interaction,
+        message_id: int,
+        delay: float,
+        **kwargs: Any,
+    ) -> None:
+        """Edits a game message after a delay using the given interaction.
+
+        If an edit is already pending for the message, the new changes
+        are merged into it and the combined edit is sent after this delay.
+
+        """
+        pending = self._pending_edits.get(message_id)
+        if pending is not None:
+            kwargs = pending.kwargs | kwargs
+            self.bot.metrics.increment("rps_edits_coalesced")
+        self._pending_edits[message_id] = PendingEdit(interaction, kwargs)
+        self.edits.schedule(message_id, time.time() + delay)
+
+    def coalesce_edit(
+        self,
+        interaction: discord.Interaction,
+        message_id: int,
+        **kwargs: Any,
+    ) -> bool:
+        """Defers an edit to a game message if it was edited recently.
+
+        Only one edit is sent per message within the ``rps.edit_window``
+        setting, and changes made in between are merged into a pending edit
+        that is sent at the end of the window.
+
+        :returns:
+            True if the edit was deferred, or False if the caller
+            should send it now.
+
+        """
+        now = time.time()
+        last = self._last_edits.get(message_id)
+        window = self.bot.config.rps.edit_window
+        if message_id not in self._pending_edits and (
+            last is None or now - last >= window
+        ):
+            self._last_edits[message_id] = now
+            self.bot.metrics.increment("rps_edits_sent", kind="immediate")
+            return False
+
+        assert last is not None
+        self.schedule_edit(interaction, message_id, last + window - now, **kwargs)
+        return True
+
+    def cancel_edit(self, message_id: int) -> bool:
+        """Discards the pending edit of a message, if any.
+
+        :returns: True if an edit was pending, False otherwise.
+
+        """
+        self.edits.cancel(message_id)
+        if self._pending_edits.pop(message_id, None) is None:
+            return False
+        self.bot.metrics.increment("rps_edits_coalesced")
+        return True
+
+    async def _send_pending_edits(self, message_ids: list[int]) -> None:
+        edits = [
+            (message_id, self._pending_edits.pop(message_id))
+            for message_id in message_ids
+        ]
+        await asyncio.gather(*(self._send_edit(*edit) for edit in edits))
+
+    async def _send_edit(self, message_id: int, edit: PendingEdit) -> None:
+        if message_id in self.views:
+            self._last_edits[message_id] = time.time()
+        self.bot.metrics.increment("rps_edits_sent", kind="deferred")
+        try:
+            await edit.interaction.edit_original_response(**edit.kwargs)
+        except discord.HTTPException:
+            pass
+
+    async def _expire_games(self, message_ids: list[int]) -> None:
+        for message_id in message_ids:
+            view = self.views.pop(message_id, None)
+            self._last_edits.pop(message_id, None)
+            # on_timeout() replaces the message, so pending edits are dropped
+            self.edits.cancel(message_id)
+            self._pending_edits.pop(message_id, None)
+            if view is not None:
+                view.stop()
+                self._expired_views.put_nowait(view)
+
+        self.bot.metrics.set("rps_live_games", len(self.views))
+        self.bot.metrics.increment("rps_expired_games", len(message_ids))
+
+    async def _edit_expired_games(self) -> None:
+        # Spread out edits so a burst of expiring games doesn't hit rate limits.
+        # Games are only removed from the store once edited, so they expire
+        # again after restarting if they were still queued.
+        while True:
+            view = await self._expired_views.get()
+            # Read each time so reloading the config applies a new rate
+            interval = 1 / self.bot.config.rps.edit_rate
+            start = time.perf_counter()
+            try:
+                await view.on_timeout()
+            except Exception:
+                log.exception("Failed to edit expired game %d", view.message.id)
+            await self.store.remove_rps_game(view.message.id)
+            await asyncio.sleep(interval - (time.perf_counter() - start))
+
+    async def cog_load(self):
+        await self.store.open()
+
+        records = await self.store.load_rps_games()
+        for record in records:
+            view_cls = self.VARIANTS.get(record.variant)
+            moveset = self.MOVESETS.get(record.moveset)
+            if view_cls is None or moveset is None:
+                log.warning(
+                    "Removing game %d with unknown variant %r or moveset %r",
+                    record.message_id,
+                    record.variant,
+                    record.moveset,
+                )
+                await self.store.remove_rps_game(record.message_id)
+                continue
+
+            view = view_cls.from_record(self, record, _create_buttons(*moveset))
+            self.bot.add_view(view, message_id=record.message_id)
+            self.add_game(view)
+
+        if records:
+            log.info("Resumed %d rock-paper-scissors game(s)", len(self.views))
+
+        self.expiry.start()
+        self.edits.start()
+        self._edit_task = asyncio.create_task(self._edit_expired_games())
+
+    async def cog_unload(self):
+        await self.expiry.close()
+        await self.edits.close()
+        await self._send_pending_edits(list(self._pending_edits))
+        if self._edit_task is not None:
+            self._edit_task.cancel()
+
+        # Games stay in the store so they can be resumed when reloaded
+        for view in self.views.values():
+            view.stop()
+        self.views.clear()
+        self.bot.metrics.set("rps_live_games", 0)
+        await self.store.close()
 
     @app_commands.command(
         # Command name
@@ -295,17 +875,67 @@ class RPS(commands.Cog):
         user: discord.User | None = None,
     ):
         view = RPSDuelView(
-            interaction,
+            self,
+            interaction.locale,
             _create_buttons(*self.STANDARD),
             (
-                {interaction.user, user}
+                {interaction.user.id, user.id}
                 if user is not None and user != interaction.user
                 else set()
             ),
-            timeout=180,
+            timeout=self.bot.config.rps.timeout,
+        )
+
+        await view.start(interaction, wait=False)
+
+    @app_commands.command(
+        # Command name
+        name=_("rock-paper-scissors-lobby"),
+        # Command description ("rock-paper-scissors-lobby")
+        description=_("Start a game of rock, paper, scissors that anyone can join."),
+    )
+    @app_commands.describe(
+        # Command parameter description ("players")
+        players=_("The number of players needed to finish the game."),
+        # Command parameter description ("moveset")
+        moveset=_("The moves that players can pick from."),
+    )
+    @app_commands.rename(
+        # Command parameter name (used by "rock-paper-scissors-lobby")
+        players=_("players"),
+        # Command parameter name (used by "rock-paper-scissors-lobby")
+        moveset=_("moveset"),
+    )
+    @app_commands.choices(
+        moveset=[
+            app_commands.Choice(
+                # Command parameter choice (used by "/rock-paper-scissors-lobby <moveset>")
+                name=_("Rock, paper, scissors"),
+                value="standard",
+            ),
+            app_commands.Choice(
+                # Command parameter choice (used by "/rock-paper-scissors-lobby <moveset>")
+                name=_("Rock, paper, scissors, lizard, Spock"),
+                value="extended",
+            ),
+        ],
+    )
+    async def rps_lobby(
+        self,
+        interaction: discord.Interaction,
+        players: app_commands.Range[int, 2, 100] = 3,
+        moveset: str = "standard",
+    ):
+        view = RPSLobbyView(
+            self,
+            interaction.locale,
+            _create_buttons(*self.MOVESETS[moveset]),
+            players,
+            timeout=self.bot.config.rps.timeout,
+            moveset=moveset,
         )
 
-        await view.start()
+        await view.start(interaction, wait=False)
 
 
 async def setup(bot: DPyGT):
@@ -1,11 +1,31 @@
 from __future__ import annotations
 
+import copy
+import functools
+import hashlib
 import importlib.resources
 import tomllib
 from pathlib import Path
-from typing import IO, TYPE_CHECKING, Any, Literal, Protocol
-
-from pydantic import BaseModel, ConfigDict
+from types import MappingProxyType
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Annotated,
+    Any,
+    Iterator,
+    Literal,
+    Mapping,
+    NamedTuple,
+    Protocol,
+)
+
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    ConfigDict,
+    NonNegativeFloat,
+    PositiveFloat,
+)
 
 if TYPE_CHECKING:
     import discord
@@ -15,6 +35,16 @@ CONFIG_DEFAULT_RESOURCE = _package_files.joinpath("config_default.toml")
 CONFIG_PATH = Path("config.toml")
 
 
+def _validate_locale(value: str) -> str:
+    import discord
+
+    # Raises ValueError for unknown locales, reported as a validation error
+    return discord.Locale(value).value
+
+
+LocaleCode = Annotated[str, AfterValidator(_validate_locale)]
+
+
 class _BaseModel(BaseModel):
     class Config:
         extra = "forbid"
@@ -23,14 +53,34 @@ class _BaseModel(BaseModel):
 # https://docs.pydantic.dev/usage/settings/
 class DPyGTSettings(_BaseModel):
     bot: DPyGTSettingsBot
+    rps: DPyGTSettingsRPS
+    translator: DPyGTSettingsTranslator
+
+    def freeze(self) -> DPyGTConfig:
+        """Converts the settings into an immutable snapshot."""
+        return DPyGTConfig(
+            bot=self.bot.freeze(),
+            rps=self.rps.freeze(),
+            translator=self.translator.freeze(),
+        )
 
 
 class DPyGTSettingsBot(_BaseModel):
     allow_jishaku: bool
     extensions: list[str]
     intents: DPyGTSettingsBotIntents
+    lazy_extensions: bool
     token: str
 
+    def freeze(self) -> DPyGTConfigBot:
+        return DPyGTConfigBot(
+            allow_jishaku=self.allow_jishaku,
+            extensions=tuple(self.extensions),
+            intents=MappingProxyType(self.intents.model_dump()),
+            lazy_extensions=self.lazy_extensions,
+            token=self.token,
+        )
+
 
 class DPyGTSettingsBotIntents(_BaseModel):
     """The intents used when connecting to the Discord gateway.
@@ -43,16 +93,159 @@ class DPyGTSettingsBotIntents(_BaseModel):
 
     model_config = ConfigDict(extra="allow")
 
+
+class DPyGTSettingsRPS(_BaseModel):
+    database: str
+    edit_rate: PositiveFloat
+    edit_window: NonNegativeFloat
+    timeout: float
+
+    def freeze(self) -> DPyGTConfigRPS:
+        return DPyGTConfigRPS(
+            database=self.database,
+            edit_rate=self.edit_rate,
+            edit_window=self.edit_window,
+            timeout=self.timeout,
+        )
+
+
+class DPyGTSettingsTranslator(_BaseModel):
+    catalog_backend: Literal["gettext", "mmap"]
+    use_bundle: bool
+    fallbacks: dict[LocaleCode, list[LocaleCode]]
+
+    def freeze(self) -> DPyGTConfigTranslator:
+        return DPyGTConfigTranslator(
+            catalog_backend=self.catalog_backend,
+            use_bundle=self.use_bundle,
+            fallbacks=MappingProxyType(
+                {locale: tuple(f) for locale, f in self.fallbacks.items()}
+            ),
+        )
+
+
+DPyGTSettings.model_rebuild()
+DPyGTSettingsBot.model_rebuild()
+
+
+# Immutable snapshots of the settings above, so reading the configuration
+# doesn't need to go through pydantic
+class DPyGTConfig(NamedTuple):
+    bot: DPyGTConfigBot
+    rps: DPyGTConfigRPS
+    translator: DPyGTConfigTranslator
+
+
+class DPyGTConfigBot(NamedTuple):
+    allow_jishaku: bool
+    extensions: tuple[str, ...]
+    intents: Mapping[str, Any]
+    lazy_extensions: bool
+    token: str
+
     def create_intents(self) -> discord.Intents:
         import discord
 
         intents = dict(discord.Intents.default())
-        intents |= self.model_dump()
+        intents |= self.intents
         return discord.Intents(**intents)
 
 
-DPyGTSettings.model_rebuild()
-DPyGTSettingsBot.model_rebuild()
+class DPyGTConfigRPS(NamedTuple):
+    database: str
+    edit_rate: float
+    edit_window: float
+    timeout: float
+
+
+class DPyGTConfigTranslator(NamedTuple):
+    catalog_backend: Literal["gettext", "mmap"]
+    use_bundle: bool
+    fallbacks: Mapping[str, tuple[str, ...]]
+
+    def create_fallbacks(self) -> dict[discord.Locale, list[discord.Locale]]:
+        import discord
+
+        return {
+            discord.Locale(locale): [discord.Locale(f) for f in fallbacks]
+            for locale, fallbacks in self.fallbacks.items()
+        }
+
+
+# Settings that only take effect when connecting to Discord
+RECONNECT_SETTINGS = frozenset({"bot.token", "bot.intents"})
+# Settings that only take effect when the extension using them is reloaded
+EXTENSION_RELOAD_SETTINGS = frozenset({"rps.database"})
+
+
+class ConfigDiff(NamedTuple):
+    """The settings that changed between two configurations.
+
+    Settings are named by their dotted path, e.g. ``bot.token``.
+
+    """
+
+    changed: list[str]
+    extensions_added: list[str]
+    extensions_removed: list[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.changed)
+
+    @property
+    def requires_reconnect(self) -> list[str]:
+        """The changed settings that need a reconnect to take effect."""
+        return [name for name in self.changed if name in RECONNECT_SETTINGS]
+
+    @property
+    def requires_extension_reload(self) -> list[str]:
+        """The changed settings that need an extension reload to take effect."""
+        return [name for name in self.changed if name in EXTENSION_RELOAD_SETTINGS]
+
+    def describe(self) -> str:
+        """Returns a human-readable summary of the changes."""
+        lines: list[str] = []
+        for label, names in (
+            ("Changed", self.changed),
+            ("Extensions added", self.extensions_added),
+            ("Extensions removed", self.extensions_removed),
+        ):
+            if names:
+                lines.append(f"{label}: {', '.join(names)}")
+        return "\n".join(lines)
+
+
+def _diff_fields(old: tuple, new: tuple, prefix: str = "") -> Iterator[str]:
+    for name in old._fields:  # type: ignore
+        old_value, new_value = getattr(old, name), getattr(new, name)
+        if old_value == new_value:
+            continue
+        elif hasattr(old_value, "_fields"):
+            yield from _diff_fields(old_value, new_value, f"{prefix}{name}.")
+        else:
+            yield f"{prefix}{name}"
+
+
+def diff_config(old: DPyGTConfig, new: DPyGTConfig) -> ConfigDiff:
+    """Compares two configurations."""
+    old_extensions = set(old.bot.extensions)
+    new_extensions = set(new.bot.extensions)
+    return ConfigDiff(
+        changed=list(_diff_fields(old, new)),
+        extensions_added=[e for e in new.bot.extensions if e not in old_extensions],
+        extensions_removed=[e for e in old.bot.extensions if e not in new_extensions],
+    )
+
+
+class _ConfigFile(NamedTuple):
+    mtime_ns: int
+    size: int
+    digest: bytes
+    config: DPyGTConfig
+
+
+# The last configuration loaded for each value of merge_default
+_config_cache: dict[bool, _ConfigFile] = {}
 
 
 class OpenableBinary(Protocol):
@@ -73,21 +266,32 @@ def _load_raw_config(path: OpenableBinary) -> dict[str, Any]:
         return tomllib.load(f)
 
 
-def load_default_config() -> DPyGTSettings:
+@functools.cache
+def _load_default_data() -> dict[str, Any]:
+    # The default configuration is packaged with the bot and doesn't change
+    return _load_raw_config(CONFIG_DEFAULT_RESOURCE)
+
+
+@functools.cache
+def load_default_config() -> DPyGTConfig:
     """Loads the default configuration file.
 
+    The result is cached after the first call.
+
     :returns: The settings that were parsed.
     :raises FileNotFoundError:
         The default configuration file could not be found.
 
     """
-    data = _load_raw_config(CONFIG_DEFAULT_RESOURCE)
-    return DPyGTSettings.model_validate(data)
+    return DPyGTSettings.model_validate(_load_default_data()).freeze()
 
 
-def load_config(*, merge_default: bool = True) -> DPyGTSettings:
+def load_config(*, merge_default: bool = True) -> DPyGTConfig:
     """Loads the bot configuration file.
 
+    If the configuration file hasn't changed since it was last loaded,
+    the previous settings are returned without parsing it again.
+
     :param merge_default:
         If True, the default configuration file will be used as a base
         and the normal configuration is applied on top of it,
@@ -99,13 +303,38 @@ def load_config(*, merge_default: bool = True) -> DPyGTSettings:
         file could not be found.
 
     """
-    if not merge_default:
-        data = _load_raw_config(CONFIG_PATH)
-    elif CONFIG_PATH.exists():
-        data = _load_raw_config(CONFIG_DEFAULT_RESOURCE)
-        overwrites = _load_raw_config(CONFIG_PATH)
-        _recursive_update(data, overwrites)
+    try:
+        stat = CONFIG_PATH.stat()
+    except FileNotFoundError:
+        _config_cache.pop(merge_default, None)
+        if merge_default:
+            return load_default_config()
+        raise
+
+    old = _config_cache.get(merge_default)
+    if (
+        old is not None
+        and old.mtime_ns == stat.st_mtime_ns
+        and old.size == stat.st_size
+    ):
+        return old.config
+
+    content = CONFIG_PATH.read_bytes()
+    digest = hashlib.sha256(content).digest()
+    if old is not None and old.digest == digest:
+        config = old.config
     else:
-        data = _load_raw_config(CONFIG_DEFAULT_RESOURCE)
-
-    return DPyGTSettings.model_validate(data)
+        data = tomllib.loads(content.decode())
+        if merge_default:
+            overwrites = data
+            data = copy.deepcopy(_load_default_data())
+            _recursive_update(data, overwrites)
+        config = DPyGTSettings.model_validate(data).freeze()
+
+    _config_cache[merge_default] = _ConfigFile(
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        digest=digest,
+        config=config,
+    )
+    return config
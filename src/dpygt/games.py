@@ -0,0 +1,234 @@
+"""Stores the state of active games so they can be resumed after restarting."""
+
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Callable, NamedTuple, TypeVar
+
+T = TypeVar("T")
+
+# Each script upgrades the database by one version, tracked by PRAGMA user_version.
+# Databases created before versioning are at version 0 but already have the
+# first version's tables, so those are created only if they don't exist.
+MIGRATIONS = (
+    """
+CREATE TABLE IF NOT EXISTS rps_game (
+    message_id INTEGER PRIMARY KEY,
+    channel_id INTEGER NOT NULL,
+    variant TEXT NOT NULL,
+    locale TEXT NOT NULL,
+    public INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rps_player (
+    message_id INTEGER NOT NULL REFERENCES rps_game ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    move INTEGER,
+    PRIMARY KEY (message_id, position)
+) WITHOUT ROWID;
+""",
+    """
+ALTER TABLE rps_game ADD COLUMN max_players INTEGER NOT NULL DEFAULT 2;
+ALTER TABLE rps_game ADD COLUMN moveset TEXT NOT NULL DEFAULT 'standard';
+""",
+)
+
+
+class RPSGameRecord(NamedTuple):
+    """The saved state of a Rock, Paper, Scissors game.
+
+    Players are listed in the order they joined the game, each paired
+    with the value of their move, or None if they haven't picked one yet.
+    The expiry time is a POSIX timestamp.
+
+    """
+
+    message_id: int
+    channel_id: int
+    variant: str
+    locale: str
+    public: bool
+    expires_at: float
+    max_players: int
+    moveset: str
+    players: list[tuple[int, int | None]]
+
+
+class GameStore:
+    """Saves active games to an SQLite database in WAL mode.
+
+    Queries run on a single background thread so they don't block the
+    event loop, and writes are applied in the order they were made.
+
+    :param path: The path of the database file, created if it doesn't exist.
+
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="dpygt-games",
+        )
+        self._conn: sqlite3.Connection | None = None
+
+    def _run(self, func: Callable[..., T], *args: Any) -> asyncio.Future[T]:
+        # Submitted immediately, so the order of calls is preserved
+        # even if the caller awaits the result later
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(self._executor, func, *args)
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise RuntimeError("game store is not open")
+        return self._conn
+
+    async def open(self) -> None:
+        """Opens the database and creates any missing tables."""
+        await self._run(self._open)
+
+    def _open(self) -> None:
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode = WAL")
+        # With WAL, this can only lose the latest commits on power loss
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+        _migrate(conn)
+        self._conn = conn
+
+    async def close(self) -> None:
+        """Closes the database once every pending write is done."""
+        await self._run(self._close)
+        self._executor.shutdown()
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def load_rps_games(self) -> asyncio.Future[list[RPSGameRecord]]:
+        """Loads every saved Rock, Paper, Scissors game at once."""
+        return self._run(self._load_rps_games)
+
+    def _load_rps_games(self) -> list[RPSGameRecord]:
+        rows = self.conn.execute(
+            "SELECT message_id, user_id, move FROM rps_player "
+            "ORDER BY message_id, position"
+        )
+        players = {
+            message_id: [(user_id, move) for _, user_id, move in group]
+            for message_id, group in groupby(rows, key=itemgetter(0))
+        }
+
+        rows = self.conn.execute(
+            "SELECT message_id, channel_id, variant, locale, public, expires_at, "
+            "max_players, moveset FROM rps_game"
+        )
+        return [
+            RPSGameRecord(
+                message_id=row[0],
+                channel_id=row[1],
+                variant=row[2],
+                locale=row[3],
+                public=bool(row[4]),
+                expires_at=row[5],
+                max_players=row[6],
+                moveset=row[7],
+                players=players.get(row[0], []),
+            )
+            for row in rows
+        ]
+
+    def add_rps_game(self, record: RPSGameRecord) -> asyncio.Future[None]:
+        """Saves a new Rock, Paper, Scissors game."""
+        return self._run(self._add_rps_game, record)
+
+    def _add_rps_game(self, record: RPSGameRecord) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO rps_game VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    record.message_id,
+                    record.channel_id,
+                    record.variant,
+                    record.locale,
+                    record.public,
+                    record.expires_at,
+                    record.max_players,
+                    record.moveset,
+                ),
+            )
+            self.conn.executemany(
+                "INSERT INTO rps_player VALUES (?, ?, ?, ?)",
+                [
+                    (record.message_id, position, user_id, move)
+                    for position, (user_id, move) in enumerate(record.players)
+                ],
+            )
+
+    def set_rps_move(
+        self,
+        message_id: int,
+        position: int,
+        user_id: int,
+        move: int,
+        expires_at: float,
+    ) -> asyncio.Future[None]:
+        """Saves a player's move and extends the game's expiry time.
+
+        If no player is at the given position, they are added to the game.
+
+        """
+        return self._run(
+            self._set_rps_move,
+            message_id,
+            position,
+            user_id,
+            move,
+            expires_at,
+        )
+
+    def _set_rps_move(
+        self,
+        message_id: int,
+        position: int,
+        user_id: int,
+        move: int,
+        expires_at: float,
+    ) -> None:
+        with self.conn:
+            self.conn.execute(
+                "UPDATE rps_game SET expires_at = ? WHERE message_id = ?",
+                (expires_at, message_id),
+            )
+            self.conn.execute(
+                "INSERT INTO rps_player VALUES (?, ?, ?, ?) "
+                "ON CONFLICT DO UPDATE SET user_id = excluded.user_id, "
+                "move = excluded.move",
+                (message_id, position, user_id, move),
+            )
+
+    def remove_rps_game(self, message_id: int) -> asyncio.Future[None]:
+        """Removes a Rock, Paper, Scissors game that has ended."""
+        return self._run(self._remove_rps_game, message_id)
+
+    def _remove_rps_game(self, message_id: int) -> None:
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM rps_game WHERE message_id = ?",
+                (message_id,),
+            )
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    (version,) = conn.execute("PRAGMA user_version").fetchone()
+    for i, script in enumerate(MIGRATIONS[version:], start=version + 1):
+        # executescript() commits first, so the version is bumped in the same script
+        conn.executescript(f"BEGIN; {script} PRAGMA user_version = {i}; COMMIT;")
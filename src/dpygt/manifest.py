@@ -0,0 +1,131 @@
+"""Records the commands provided by each extension so they can be loaded lazily."""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+import discord
+from discord.ext import commands
+
+MANIFEST_PATH = Path(__file__).with_name("extensions.json")
+
+log = logging.getLogger(__name__)
+
+
+class ExtensionEntry(NamedTuple):
+    """The commands added by an extension when it was last inspected.
+
+    Application commands are stored as (type, name) pairs, and prefix
+    commands include their aliases. The digest of the extension's source
+    file is used to detect when the entry is out of date.
+
+    """
+
+    digest: str
+    app_commands: list[tuple[int, str]]
+    commands: list[str]
+
+
+def get_extension_digest(name: str, package: str | None = None) -> str | None:
+    """Hashes the source file of an extension without importing it.
+
+    For packages, only the ``__init__.py`` file is hashed.
+
+    :returns: The digest, or None if the extension could not be found.
+
+    """
+    name = importlib.util.resolve_name(name, package)
+    try:
+        spec = importlib.util.find_spec(name)
+    except ImportError:
+        return None
+    if spec is None or spec.origin is None or not os.path.isfile(spec.origin):
+        return None
+    # Normalize line endings so the digest doesn't depend on the checkout
+    source = Path(spec.origin).read_bytes().replace(b"\r\n", b"\n")
+    return hashlib.sha256(source).hexdigest()
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> dict[str, ExtensionEntry]:
+    """Loads the manifest, or returns an empty one if it doesn't exist."""
+    try:
+        with path.open("rb") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+
+    return {
+        name: ExtensionEntry(
+            digest=entry["digest"],
+            app_commands=[(t, n) for t, n in entry["app_commands"]],
+            commands=entry["commands"],
+        )
+        for name, entry in data["extensions"].items()
+    }
+
+
+def write_manifest(
+    manifest: dict[str, ExtensionEntry],
+    path: Path = MANIFEST_PATH,
+) -> None:
+    data = {
+        "extensions": {name: entry._asdict() for name, entry in manifest.items()},
+    }
+    temp = path.with_name(path.name + ".tmp")
+    temp.write_text(json.dumps(data, indent=4) + "\n")
+    os.replace(temp, path)
+
+
+def _get_app_commands(tree: discord.app_commands.CommandTree) -> set[tuple[int, str]]:
+    return {
+        (t.value, command.name)
+        for t in discord.AppCommandType
+        for command in tree.get_commands(type=t)
+    }
+
+
+async def build_manifest(
+    bot: commands.Bot,
+    names: Iterable[str],
+    package: str | None = None,
+) -> dict[str, ExtensionEntry]:
+    """Loads each extension one at a time to record the commands they add.
+
+    Extensions that set ``LAZY = False`` at module level, e.g. because they
+    register persistent views, are left out so they are always loaded eagerly.
+
+    :param bot: A bot that doesn't have any of the extensions loaded yet.
+    :param names: The extensions to inspect.
+    :param package: The package used to resolve relative extension names.
+
+    """
+    manifest: dict[str, ExtensionEntry] = {}
+    for name in names:
+        digest = get_extension_digest(name, package)
+        if digest is None:
+            log.warning("Skipping extension %s as its source could not be found", name)
+            continue
+
+        app_commands_before = _get_app_commands(bot.tree)
+        commands_before = set(bot.all_commands)
+        await bot.load_extension(name, package=package)
+
+        module = sys.modules[importlib.util.resolve_name(name, package)]
+        if not getattr(module, "LAZY", True):
+            log.info("Skipping extension %s as it can't be loaded lazily", name)
+            continue
+
+        manifest[name] = ExtensionEntry(
+            digest=digest,
+            app_commands=sorted(_get_app_commands(bot.tree) - app_commands_before),
+            commands=sorted(bot.all_commands.keys() - commands_before),
+        )
+
+    return manifest
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import bisect
+from typing import Protocol
+
+Labels = tuple[tuple[str, str], ...]
+
+# Upper bounds in seconds, spaced roughly logarithmically from 1us to 10s
+DEFAULT_BUCKETS = tuple(
+    m * 10.0**e for e in range(-6, 1) for m in (1.0, 2.5, 5.0)
+) + (10.0,)
+
+
+class MetricsHook(Protocol):
+    """The interface used to report metrics.
+
+    Any object implementing these methods can be used to forward metrics
+    to another system, such as Prometheus or StatsD.
+
+    """
+
+    def increment(self, name: str, value: int = 1, /, **labels: str) -> None:
+        """Increments a counter."""
+        ...
+
+    def observe(self, name: str, value: float, /, **labels: str) -> None:
+        """Records a sample in a histogram, e.g. a latency in seconds."""
+        ...
+
+    def set(self, name: str, value: float, /, **labels: str) -> None:
+        """Sets the current value of a gauge."""
+        ...
+
+
+class Histogram:
+    """A histogram of samples grouped into fixed buckets.
+
+    :param buckets: The sorted upper bounds of each bucket.
+
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        # The last count is for samples larger than every bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimates a quantile as the upper bound of the bucket containing it."""
+        if self.count == 0:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return self.buckets[min(i, len(self.buckets) - 1)]
+        return self.buckets[-1]
+
+
+class InMemoryMetrics:
+    """Collects metrics in memory so they can be inspected at runtime."""
+
+    def __init__(self) -> None:
+        self.counters: dict[tuple[str, Labels], int] = {}
+        self.gauges: dict[tuple[str, Labels], float] = {}
+        self.histograms: dict[tuple[str, Labels], Histogram] = {}
+
+    def increment(self, name: str, value: int = 1, /, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, /, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram()
+        histogram.observe(value)
+
+    def set(self, name: str, value: float, /, **labels: str) -> None:
+        self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def clear(self) -> None:
+        """Discards all collected metrics."""
+        self.counters.clear()
+        self.gauges.clear()
+        self.histograms.clear()
+
+    def dump(self, prefix: str = "") -> str:
+        """Formats every metric whose name starts with the given prefix."""
+        lines: list[str] = []
+
+        for (name, labels), value in sorted(self.counters.items()):
+            if name.startswith(prefix):
+                lines.append(f"{name}{_format_labels(labels)} {value}")
+
+        for (name, labels), value in sorted(self.gauges.items()):
+            if name.startswith(prefix):
+                lines.append(f"{name}{_format_labels(labels)} {value:g}")
+
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            if name.startswith(prefix):
+                lines.append(
+                    f"{name}{_format_labels(labels)} "
+                    f"count={histogram.count} "
+                    f"sum={histogram.sum:.6f} "
+                    f"p50<={histogram.quantile(0.5):g} "
+                    f"p99<={histogram.quantile(0.99):g}"
+                )
+
+        return "\n".join(lines)
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f"{k}={v!r}" for k, v in labels) + "}"
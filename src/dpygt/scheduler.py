@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+
+log = logging.getLogger(__name__)
+
+
+class ExpiryScheduler(Generic[K]):
+    """Calls a function with batches of keys once their deadlines pass.
+
+    Deadlines are kept in a heap that a single task waits on, instead of
+    each key needing its own timer. Rescheduling or cancelling a key leaves
+    its old entry in the heap, which is skipped once it's popped.
+
+    :param callback: The function called with the keys that expired together.
+    :param batch_window:
+        The seconds after the earliest deadline for which other keys
+        are expired in the same batch.
+
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[list[K]], Awaitable[None]],
+        *,
+        batch_window: float = 1.0,
+    ) -> None:
+        self.callback = callback
+        self.batch_window = batch_window
+        self._deadlines: dict[K, float] = {}
+        # The counter breaks ties so keys never need to be compared
+        self._heap: list[tuple[float, int, K]] = []
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self._deadlines)
+
+    def schedule(self, key: K, deadline: float) -> None:
+        """Schedules a key to expire at the given POSIX timestamp,
+        replacing its previous deadline if any.
+        """
+        self._deadlines[key] = deadline
+        entry = (deadline, next(self._counter), key)
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry:
+            # Wake up the task to wait for the new earliest deadline
+            self._wakeup.set()
+
+    def cancel(self, key: K) -> bool:
+        """Stops a key from expiring.
+
+        :returns: True if the key was scheduled, False otherwise.
+
+        """
+        return self._deadlines.pop(key, None) is not None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stops the scheduler without expiring any remaining keys."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _pop_stale(self) -> None:
+        heap = self._heap
+        while heap and self._deadlines.get(heap[0][2]) != heap[0][0]:
+            heapq.heappop(heap)
+
+    def _pop_expired(self, until: float) -> list[K]:
+        expired: list[K] = []
+        heap = self._heap
+        while heap and heap[0][0] <= until:
+            deadline, _, key = heapq.heappop(heap)
+            if self._deadlines.get(key) == deadline:
+                del self._deadlines[key]
+                expired.append(key)
+        return expired
+
+    async def _run(self) -> None:
+        while True:
+            self._pop_stale()
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            expired = self._pop_expired(time.time() + self.batch_window)
+            if not expired:
+                continue
+
+            try:
+                await self.callback(expired)
+            except Exception:
+                log.exception(
+                    "Ignoring exception while expiring %d key(s)", len(expired)
+                )
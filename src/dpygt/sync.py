@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Mapping, NamedTuple
+
+import discord
+from discord import app_commands
+
+SYNC_STATE_PATH = Path("sync_state.json")
+
+log = logging.getLogger(__name__)
+
+
+async def get_command_payload(
+    tree: app_commands.CommandTree,
+    guild: discord.abc.Snowflake | None = None,
+) -> list[dict[str, Any]]:
+    """Returns the localized payload that would be uploaded by
+    :meth:`discord.app_commands.CommandTree.sync()`.
+
+    :param tree: The command tree to generate the payload from.
+    :param guild: The guild to generate the payload for, or None for global commands.
+
+    """
+    commands = tree.get_commands(guild=guild)
+    translator = tree.translator
+    if translator is None:
+        return [command.to_dict(tree) for command in commands]
+    return [
+        await command.get_translated_payload(tree, translator) for command in commands
+    ]
+
+
+def get_payload_digests(payload: list[dict[str, Any]]) -> dict[str, str]:
+    """Hashes each command in a payload, keyed by their type and name."""
+    digests: dict[str, str] = {}
+    for command in payload:
+        key = f"{command.get('type', 1)}:{command['name']}"
+        data = json.dumps(command, sort_keys=True, separators=(",", ":"))
+        digests[key] = hashlib.sha256(data.encode()).hexdigest()
+    return digests
+
+
+class SyncDiff(NamedTuple):
+    """The commands that changed since the last synchronization."""
+
+    added: list[str]
+    removed: list[str]
+    changed: list[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def describe(self) -> str:
+        """Returns a human-readable summary of the changes."""
+        lines: list[str] = []
+        for label, keys in (
+            ("Added", self.added),
+            ("Changed", self.changed),
+            ("Removed", self.removed),
+        ):
+            if keys:
+                names = ", ".join(key.partition(":")[2] for key in keys)
+                lines.append(f"{label}: {names}")
+        return "\n".join(lines)
+
+
+def diff_digests(old: Mapping[str, str], new: Mapping[str, str]) -> SyncDiff:
+    """Compares the command digests of two payloads."""
+    return SyncDiff(
+        added=sorted(new.keys() - old.keys()),
+        removed=sorted(old.keys() - new.keys()),
+        changed=sorted(k for k in new.keys() & old.keys() if new[k] != old[k]),
+    )
+
+
+class SyncState:
+    """Persists the command digests of each synchronization to disk.
+
+    :param path: The JSON file used to store digests.
+
+    """
+
+    def __init__(self, path: Path = SYNC_STATE_PATH) -> None:
+        self.path = path
+
+    @staticmethod
+    def _get_key(application_id: int, guild: discord.abc.Snowflake | None) -> str:
+        scope = "global" if guild is None else str(guild.id)
+        return f"{application_id}/{scope}"
+
+    def _read(self) -> dict[str, dict[str, str]]:
+        try:
+            with self.path.open("rb") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            log.warning("Ignoring malformed sync state in %s", self.path)
+            return {}
+
+    def get(
+        self,
+        application_id: int,
+        guild: discord.abc.Snowflake | None,
+    ) -> dict[str, str]:
+        """Returns the digests from the last synchronization, if any."""
+        return self._read().get(self._get_key(application_id, guild), {})
+
+    def set(
+        self,
+        application_id: int,
+        guild: discord.abc.Snowflake | None,
+        digests: dict[str, str],
+    ) -> None:
+        """Saves the digests of a successful synchronization."""
+        state = self._read()
+        state[self._get_key(application_id, guild)] = digests
+
+        # Write to a temporary file first so a crash can't corrupt the state
+        temp = self.path.with_name(self.path.name + ".tmp")
+        temp.write_text(json.dumps(state, indent=4, sort_keys=True))
+        os.replace(temp, self.path)
@@ -0,0 +1,282 @@
+"""Provides format strings that are parsed ahead of time."""
+
+from __future__ import annotations
+
+import functools
+import re
+import string
+from typing import Any, Iterable, Iterator, NamedTuple
+
+_formatter = string.Formatter()
+# Matches the start of the next attribute or index in a field name
+_FIELD_ACCESSOR = re.compile(r"[.\[]")
+
+
+def _to_key(name: str) -> int | str:
+    return int(name) if name.isdecimal() else name
+
+
+def _split_field_name(
+    field_name: str,
+) -> tuple[int | str, list[tuple[bool, int | str]]]:
+    """Splits a field name into its first part and each attribute or index after it.
+
+    This follows the same rules as :meth:`str.format()`, where each
+    accessor is paired with True for attributes and False for indices.
+
+    :raises ValueError: The field name is malformed.
+
+    """
+    match = _FIELD_ACCESSOR.search(field_name)
+    if match is None:
+        return _to_key(field_name), []
+
+    first = field_name[: match.start()]
+    rest: list[tuple[bool, int | str]] = []
+    i = match.start()
+    while i < len(field_name):
+        if field_name[i] == ".":
+            match = _FIELD_ACCESSOR.search(field_name, i + 1)
+            end = match.start() if match is not None else len(field_name)
+            name = field_name[i + 1 : end]
+            if name == "":
+                raise ValueError("Empty attribute in format string")
+            rest.append((True, name))
+            i = end
+        elif field_name[i] == "[":
+            end = field_name.find("]", i + 1)
+            if end == -1:
+                raise ValueError("Missing ']' in format string")
+            name = field_name[i + 1 : end]
+            if name == "":
+                raise ValueError("Empty attribute in format string")
+            rest.append((False, _to_key(name)))
+            i = end + 1
+        else:
+            raise ValueError("Only '.' or '[' may follow ']' in format field specifier")
+
+    return _to_key(first), rest
+
+
+class _FieldNumbering:
+    """Numbers automatic fields across a format string and its nested
+    format specs, following the same rules as :meth:`str.format()`.
+    """
+
+    __slots__ = ("next_index", "manual")
+
+    def __init__(self) -> None:
+        self.next_index = 0
+        self.manual = False
+
+    def number(self, field_name: str) -> str:
+        """Returns the field name with its automatic index filled in, if any.
+
+        :raises ValueError: Automatic and manual numbering are mixed.
+
+        """
+        match = _FIELD_ACCESSOR.search(field_name)
+        first = field_name if match is None else field_name[: match.start()]
+        if first == "":
+            if self.manual:
+                raise ValueError(
+                    "cannot switch from manual field specification "
+                    "to automatic field numbering"
+                )
+            field_name = f"{self.next_index}{field_name}"
+            self.next_index += 1
+        elif first.isdecimal():
+            if self.next_index > 0:
+                raise ValueError(
+                    "cannot switch from automatic field numbering "
+                    "to manual field specification"
+                )
+            self.manual = True
+        return field_name
+
+
+# str.format() only allows fields to be nested in the format spec of another field
+_MAX_DEPTH = 2
+
+
+def _parse_fields(
+    source: str,
+    numbering: _FieldNumbering,
+    depth: int,
+) -> Iterator[tuple[str, str | None, str | None, str | None]]:
+    # Same as string.Formatter.parse(), but with automatic fields numbered
+    if depth > _MAX_DEPTH:
+        raise ValueError("Max string recursion exceeded")
+    for literal, field_name, format_spec, conversion in _formatter.parse(source):
+        if field_name is not None:
+            field_name = numbering.number(field_name)
+        yield literal, field_name, format_spec, conversion
+
+
+class _Field(NamedTuple):
+    first: int | str
+    rest: tuple[tuple[bool, int | str], ...]
+    conversion: str | None
+    # Specs with nested fields are parsed into parts of their own
+    spec: str | tuple[str | _Field, ...]
+
+
+def _parse(
+    source: str,
+    numbering: _FieldNumbering,
+    depth: int = 1,
+) -> tuple[str | _Field, ...]:
+    parts: list[str | _Field] = []
+    for literal, field_name, format_spec, conversion in _parse_fields(
+        source, numbering, depth
+    ):
+        if literal:
+            parts.append(literal)
+        if field_name is None:
+            continue
+
+        first, rest = _split_field_name(field_name)
+        spec: str | tuple[str | _Field, ...] = format_spec or ""
+        if "{" in spec:
+            # Nested fields continue the numbering of the outer string
+            spec = _parse(spec, numbering, depth + 1)
+
+        parts.append(_Field(first, tuple(rest), conversion, spec))
+
+    return tuple(parts)
+
+
+def _render(
+    parts: tuple[str | _Field, ...],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> str:
+    rendered: list[str] = []
+    for part in parts:
+        if isinstance(part, str):
+            rendered.append(part)
+            continue
+
+        first, rest, conversion, spec = part
+        obj = args[first] if isinstance(first, int) else kwargs[first]
+        for is_attr, key in rest:
+            obj = getattr(obj, key) if is_attr else obj[key]  # type: ignore
+
+        if conversion is not None:
+            obj = _formatter.convert_field(obj, conversion)
+        if not isinstance(spec, str):
+            spec = _render(spec, args, kwargs)
+
+        rendered.append(format(obj, spec))
+
+    return "".join(rendered)
+
+
+class Template:
+    """A :meth:`str.format()` string that only needs to be parsed once.
+
+    Rendering a template with :meth:`format()` produces the same result
+    as calling :meth:`str.format()` on its source.
+
+    :param source: The format string to parse.
+    :raises ValueError: The source is not a valid format string.
+
+    """
+
+    __slots__ = ("source", "_parts")
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self._parts = _parse(source, _FieldNumbering())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.source!r})"
+
+    def format(self, *args: Any, **kwargs: Any) -> str:
+        """Renders the template with the given arguments."""
+        return _render(self._parts, args, kwargs)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_template(source: str) -> Template:
+    """Returns a cached template for the given format string."""
+    return Template(source)
+
+
+def get_fields(source: str) -> frozenset[str] | None:
+    """Returns the replacement fields used by a format string.
+
+    Automatically numbered fields are returned with their implicit index,
+    and fields nested in format specs are included.
+
+    :returns: The fields, or None if the string is not a valid format string.
+
+    """
+    fields: set[str] = set()
+    try:
+        _collect_fields(source, _FieldNumbering(), fields)
+    except ValueError:
+        return None
+    return frozenset(fields)
+
+
+def _collect_fields(
+    source: str,
+    numbering: _FieldNumbering,
+    fields: set[str],
+    depth: int = 1,
+) -> None:
+    for _, field_name, format_spec, _ in _parse_fields(source, numbering, depth):
+        if field_name is None:
+            continue
+        fields.add(field_name)
+        if format_spec and "{" in format_spec:
+            _collect_fields(format_spec, numbering, fields, depth + 1)
+
+
+def validate_translation(msgid: str, msgstr: str) -> str | None:
+    """Checks that a translation uses the same fields as its original message.
+
+    Plural messages should have their singular and plural IDs, as well as
+    each translated form, separated by NUL characters. Since a plural form
+    may leave out the number, each form only needs to use a subset of the
+    fields from the original message.
+
+    :returns: A description of the problem, or None if the translation is valid.
+
+    """
+    original_fields: frozenset[str] = frozenset()
+    for original in msgid.split("\0"):
+        fields = get_fields(original)
+        if fields is None:
+            # Not meant to be formatted, so there's nothing to compare
+            return None
+        original_fields |= fields
+
+    is_plural = "\0" in msgid
+    for form in msgstr.split("\0"):
+        fields = get_fields(form)
+        if fields is None:
+            return f"{form!r} is not a valid format string"
+        elif is_plural and not fields <= original_fields:
+            unknown = ", ".join(sorted(fields - original_fields))
+            return f"{form!r} uses unknown fields: {unknown}"
+        elif not is_plural and fields != original_fields:
+            expected = ", ".join(sorted(original_fields)) or "none"
+            return f"{form!r} does not use the same fields as the original ({expected})"
+
+    return None
+
+
+def validate_translations(messages: Iterable[tuple[str, str]]) -> list[str]:
+    """Validates each translation and returns a list of problems found."""
+    problems: list[str] = []
+    for msgid, msgstr in messages:
+        if msgid == "" or msgstr == "":
+            continue
+
+        problem = validate_translation(msgid, msgstr)
+        if problem is not None:
+            singular = msgid.partition("\0")[0]
+            problems.append(f"{singular!r}: {problem}")
+    return problems
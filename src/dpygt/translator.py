@@ -1,21 +1,45 @@
 from __future__ import annotations
 
+import asyncio
 import gettext
+import hashlib
 import importlib.resources
 import logging
+import time
+from collections import OrderedDict
+from contextlib import closing
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Iterator
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Hashable,
+    Iterable,
+    Iterator,
+    Literal,
+    Mapping,
+    NamedTuple,
+    Sequence,
+)
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
+from .catalog import MmapTranslations, open_bundle
+from .metrics import MetricsHook
+from .sync import get_command_payload
+from .template import Template, compile_template, validate_translations
+
 if TYPE_CHECKING:
     from .bot import DPyGT
 
 
 _LOCALES_PATH = Path(str(importlib.resources.files(__package__).joinpath("locales")))
 DOMAIN = "dpygt"
+BUNDLE_FILENAME = f"{DOMAIN}.bundle"
+
+CatalogBackend = Literal["gettext", "mmap"]
 
 log = logging.getLogger(__name__)
 
@@ -24,11 +48,51 @@ def locale_to_gnu(locale: discord.Locale) -> str:
     return str(locale).replace("-", "_")
 
 
-def yield_mo_paths() -> Iterator[Path]:
-    if not _LOCALES_PATH.is_dir():
+def locale_to_gnu_languages(
+    locale: discord.Locale,
+    fallbacks: Mapping[discord.Locale, Sequence[discord.Locale]] | None = None,
+) -> list[str]:
+    """Returns the GNU language names to search for the given locale,
+    from most to least specific.
+
+    This mirrors the expansion done by :func:`gettext.find()`,
+    e.g. ``pt-BR`` searches for ``pt_BR`` and then ``pt``.
+
+    :param locale: The locale to search for.
+    :param fallbacks:
+        An optional mapping of locales to other locales that should be
+        searched next, e.g. ``es-419`` to ``es-ES``. Fallbacks are followed
+        recursively before any language-only names are searched,
+        so ``es-419`` would search for ``es_419``, ``es_ES``, and then ``es``.
+
+    """
+    locales: list[discord.Locale] = [locale]
+    if fallbacks is not None:
+        # Breadth-first search so nearer fallbacks are preferred
+        for current in locales:
+            for fallback in fallbacks.get(current, ()):
+                if fallback not in locales:
+                    locales.append(fallback)
+
+    specific: list[str] = []
+    general: list[str] = []
+    for current in locales:
+        gnu = locale_to_gnu(current)
+        language, _, territory = gnu.partition("_")
+        if not territory:
+            general.append(gnu)
+        else:
+            specific.append(gnu)
+            general.append(language)
+
+    return list(dict.fromkeys(specific + general))
+
+
+def yield_mo_paths(localedir: Path = _LOCALES_PATH) -> Iterator[Path]:
+    if not localedir.is_dir():
         return
 
-    for locale in _LOCALES_PATH.iterdir():
+    for locale in localedir.iterdir():
         lc_messages = locale / "LC_MESSAGES"
         if not lc_messages.is_dir():
             continue
@@ -52,12 +116,401 @@ class EmptyTranslations(gettext.NullTranslations):
         return ""
 
 
+def load_catalog(
+    path: Path,
+    backend: CatalogBackend = "gettext",
+) -> gettext.NullTranslations:
+    """Loads a compiled .mo file into a translations object.
+
+    Unlike :func:`gettext.translation()`, the result is not shared
+    through gettext's global cache and can be safely kept around.
+
+    :param path: The path to the .mo file.
+    :param backend:
+        ``"gettext"`` to parse the entire file with :class:`gettext.GNUTranslations`,
+        or ``"mmap"`` to lazily read it with :class:`MmapTranslations`.
+
+    """
+    if backend == "mmap":
+        t = MmapTranslations(path)
+    else:
+        with path.open("rb") as f:
+            t = gettext.GNUTranslations(f)
+
+    # Normally the gettext module returns the message ID if no localization
+    # is found, but we want to replace it with None so discord.py knows
+    # that this string isn't localized.
+    # Let's add an EmptyTranslations fallback so we get empty strings
+    # for missing localizations instead.
+    t.add_fallback(EmptyTranslations())
+    return t
+
+
+def load_bundle(
+    path: Path,
+    backend: CatalogBackend = "gettext",
+) -> dict[str, gettext.NullTranslations]:
+    """Loads every language from a catalog bundle built by ``build_mo``.
+
+    Unlike individual .mo files, the bundle is opened only once
+    regardless of how many languages it contains. Every language
+    is validated with :func:`validate_translations()`.
+
+    :param path: The path to the bundle.
+    :param backend:
+        ``"mmap"`` to memory-map the bundle,
+        or ``"gettext"`` to read it into memory.
+    :returns: A mapping of GNU language names to their translations.
+    :raises InvalidCatalogError: One or more translations were invalid.
+
+    """
+    catalogs = open_bundle(path, use_mmap=backend == "mmap")
+
+    problems: list[str] = []
+    for language, t in catalogs.items():
+        problems.extend(
+            f"[{language}] {p}" for p in validate_translations(t.messages())
+        )
+    if problems:
+        raise InvalidCatalogError(path, problems)
+
+    for t in catalogs.values():
+        t.add_fallback(EmptyTranslations())
+    return dict(catalogs)
+
+
+class TranslationCache:
+    """A bounded LRU cache of translated messages.
+
+    :param maxsize: The maximum number of messages to keep.
+
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, str] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> str | None:
+        """Returns the cached message for the given key, if any."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: str) -> None:
+        """Caches a message, evicting the least recently used one if full."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all cached messages."""
+        self._data.clear()
+
+
+class InvalidCatalogError(ValueError):
+    """Raised when a catalog contains translations that cannot be used."""
+
+    def __init__(self, path: Path, problems: list[str]) -> None:
+        super().__init__(
+            f"{path} has {len(problems)} invalid translation(s):\n"
+            + "\n".join(problems)
+        )
+        self.path = path
+        self.problems = problems
+
+
+def validate_catalog(path: Path) -> None:
+    """Checks that every translation in a .mo file uses the same
+    format fields as its original message.
+
+    :raises InvalidCatalogError: One or more translations were invalid.
+
+    """
+    with closing(MmapTranslations(path)) as t:
+        problems = validate_translations(t.messages())
+
+    if problems:
+        raise InvalidCatalogError(path, problems)
+
+
+class _CatalogFile(NamedTuple):
+    mtime_ns: int
+    size: int
+    digest: bytes
+    catalogs: Mapping[str, gettext.NullTranslations]
+
+
+def _load_catalog_file(
+    path: Path,
+    backend: CatalogBackend,
+) -> Mapping[str, gettext.NullTranslations]:
+    if path.name == BUNDLE_FILENAME:
+        return load_bundle(path, backend)
+
+    validate_catalog(path)
+    # Search path will look like:
+    #     <localedir>/<language>/LC_MESSAGES/<domain>.mo
+    language = path.parent.parent.name
+    return {language: load_catalog(path, backend)}
+
+
+def _find_catalog_files(localedir: Path, use_bundle: bool) -> list[Path]:
+    if use_bundle:
+        bundle = localedir / BUNDLE_FILENAME
+        if bundle.is_file():
+            return [bundle]
+        log.warning("No catalog bundle found, falling back to .mo files")
+
+    return [path for path in yield_mo_paths(localedir) if path.stem == DOMAIN]
+
+
+def _scan_catalogs(
+    localedir: Path,
+    previous: Mapping[Path, _CatalogFile],
+    backend: CatalogBackend,
+    use_bundle: bool,
+) -> tuple[dict[Path, _CatalogFile], list[Path]]:
+    files: dict[Path, _CatalogFile] = {}
+    changed: list[Path] = []
+
+    for path in _find_catalog_files(localedir, use_bundle):
+        stat = path.stat()
+        old = previous.get(path)
+        if old is not None and old.mtime_ns == stat.st_mtime_ns:
+            if old.size == stat.st_size:
+                files[path] = old
+                continue
+
+        with path.open("rb") as f:
+            digest = hashlib.file_digest(f, "sha256").digest()
+        if old is not None and old.digest == digest:
+            # Touched but not modified, no need to parse it again
+            files[path] = old._replace(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            continue
+
+        files[path] = _CatalogFile(
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            digest=digest,
+            catalogs=_load_catalog_file(path, backend),
+        )
+        changed.append(path)
+
+    changed.extend(path for path in previous if path not in files)
+    return files, changed
+
+
+def _link_catalogs(
+    files: Mapping[Path, _CatalogFile],
+    fallbacks: Mapping[discord.Locale, Sequence[discord.Locale]],
+) -> Mapping[discord.Locale, tuple[gettext.NullTranslations, ...]]:
+    languages: dict[str, gettext.NullTranslations] = {}
+    for file in files.values():
+        languages.update(file.catalogs)
+
+    catalogs: dict[discord.Locale, tuple[gettext.NullTranslations, ...]] = {}
+    for locale in discord.Locale:
+        chain = tuple(
+            languages[language]
+            for language in locale_to_gnu_languages(locale, fallbacks)
+            if language in languages
+        )
+        if chain:
+            catalogs[locale] = chain
+
+    return MappingProxyType(catalogs)
+
+
 class GettextTranslator(app_commands.Translator):
-    def __init__(self, *args, **kwargs) -> None:
+    """Translates strings using the compiled gettext catalogs of this package.
+
+    Catalogs are parsed once when the translator is loaded by
+    :meth:`discord.app_commands.CommandTree.set_translator()`,
+    after which every lookup is served from memory. Locales without
+    any catalog are remembered so they can be skipped immediately.
+
+    Catalogs can be updated without restarting the bot by recompiling them
+    and calling :meth:`reload()`. Every catalog is checked with
+    :func:`validate_catalog()` before it is used, so loading fails if
+    any translation would break formatting.
+
+    :param localedir:
+        The directory to search for catalogs in.
+        Defaults to the locales included with this package.
+    :param backend:
+        The backend used to read catalogs. See :func:`load_catalog()`.
+    :param use_bundle:
+        If True, catalogs are loaded from a single bundle in the locale
+        directory instead of individual .mo files, if the bundle exists.
+        See :func:`load_bundle()`.
+    :param fallbacks:
+        A mapping of locales to other locales that should be used when
+        a translation is missing. See :func:`locale_to_gnu_languages()`.
+    :param cache_size:
+        The maximum number of messages cached for the :func:`translate()`
+        helper. Cached messages are discarded whenever catalogs are loaded.
+    :param metrics:
+        An optional hook to report lookup outcomes and latencies to.
+        Reporting adds a small overhead to every lookup.
+
+    """
+
+    def __init__(
+        self,
+        *args,
+        localedir: Path = _LOCALES_PATH,
+        backend: CatalogBackend = "gettext",
+        use_bundle: bool = False,
+        fallbacks: Mapping[discord.Locale, Sequence[discord.Locale]] | None = None,
+        cache_size: int = 1024,
+        metrics: MetricsHook | None = None,
+        **kwargs,
+    ) -> None:
         super().__init__(*args, **kwargs)
+        self.localedir = localedir
+        self.metrics = metrics
+        self.backend: CatalogBackend = backend
+        self.use_bundle = use_bundle
+        self.fallbacks: Mapping[discord.Locale, Sequence[discord.Locale]]
+        self.fallbacks = MappingProxyType(dict(fallbacks or {}))
+        self.cache = TranslationCache(cache_size)
+        self._files: dict[Path, _CatalogFile] = {}
+        self._catalogs: Mapping[discord.Locale, tuple[gettext.NullTranslations, ...]]
+        self._catalogs = MappingProxyType({})
+        self._missing_locales: frozenset[discord.Locale] = frozenset()
+        self._table: dict[str, dict[discord.Locale, str]] = {}
+
+    @property
+    def missing_locales(self) -> frozenset[discord.Locale]:
+        """The locales that have no catalog available."""
+        return self._missing_locales
+
+    async def load(self) -> None:
+        files, _ = await asyncio.to_thread(
+            _scan_catalogs,
+            self.localedir,
+            {},
+            self.backend,
+            self.use_bundle,
+        )
+        self._swap_catalogs(files)
 
-        if not any(yield_mo_paths()):
+        if not self._catalogs:
             log.warning("No compiled localizations detected")
+        else:
+            log.debug("Loaded catalogs for %d locale(s)", len(self._catalogs))
+
+    async def unload(self) -> None:
+        self._files = {}
+        self._catalogs = MappingProxyType({})
+        self._missing_locales = frozenset()
+        self._table = {}
+        self.cache.clear()
+
+    async def reload(self) -> list[Path]:
+        """Reloads any catalogs that were changed since they were last loaded.
+
+        Only catalogs whose contents differ are parsed again. Once done,
+        the new catalogs are swapped in all at once so lookups never see
+        a partially reloaded state.
+
+        :returns: The paths of each catalog that was added, changed, or removed.
+
+        """
+        files, changed = await asyncio.to_thread(
+            _scan_catalogs,
+            self.localedir,
+            self._files,
+            self.backend,
+            self.use_bundle,
+        )
+        if not changed:
+            self._files = files
+            return changed
+
+        self._swap_catalogs(files)
+        log.info("Reloaded %d catalog(s)", len(changed))
+        return changed
+
+    def _swap_catalogs(self, files: dict[Path, _CatalogFile]) -> None:
+        self._files = files
+        self._catalogs = _link_catalogs(files, self.fallbacks)
+        self._missing_locales = frozenset(
+            locale for locale in discord.Locale if locale not in self._catalogs
+        )
+        self._table = {}
+        self.cache.clear()
+
+    async def build_localization_table(self, tree: app_commands.CommandTree) -> int:
+        """Precomputes the localizations of every global command in a tree.
+
+        Command names, descriptions, parameters, and choices are translated
+        into every locale at once and stored in a table, so synchronizing
+        the tree afterwards only needs dictionary lookups. The table is
+        discarded whenever catalogs are reloaded.
+
+        Strings from guild-specific commands are added to the table
+        the first time they are translated.
+
+        :returns: The number of strings in the table.
+
+        """
+        await get_command_payload(tree)
+        log.debug("Built localization table with %d string(s)", len(self._table))
+        return len(self._table)
+
+    def _get_table_row(
+        self, string: app_commands.locale_str
+    ) -> dict[discord.Locale, str]:
+        row = self._table.get(string.message)
+        if row is None:
+            row = {}
+            for locale, catalogs in self._catalogs.items():
+                translated = _lookup(catalogs, string, None)
+                if translated is not None:
+                    row[locale] = translated
+            self._table[string.message] = row
+        return row
+
+    def get_plural_category(self, locale: discord.Locale, n: int) -> tuple[int, ...]:
+        """Returns the plural form selected by each catalog of a locale for n.
+
+        Any two numbers with the same category are guaranteed to produce
+        the same translation.
+
+        """
+        categories: list[int] = []
+        for t in self._catalogs.get(locale, ()):
+            plural = getattr(t, "plural", None)
+            categories.append(plural(n) if plural is not None else int(n != 1))
+        return tuple(categories)
+
+    def get_cache_key(
+        self,
+        string: app_commands.locale_str,
+        locale: discord.Locale,
+        data: Any,
+    ) -> Hashable:
+        """Returns the key used to cache the translation of a string."""
+        plural: str | None = string.extras.get("plural")
+        category: tuple[int, ...] | None = None
+        if plural is not None:
+            assert isinstance(data, int)
+            category = self.get_plural_category(locale, data)
+
+        return string.message, plural, category, locale
 
     async def translate(
         self,
@@ -65,35 +518,115 @@ class GettextTranslator(app_commands.Translator):
         locale: discord.Locale,
         context: app_commands.TranslationContextTypes,
     ) -> str | None:
-        try:
-            # Search path will look like:
-            #     <localedir>/<languages>/LC_MESSAGES/<domain>.po
-            t = gettext.translation(
-                domain=DOMAIN,
-                localedir=str(_LOCALES_PATH),
-                languages=[locale_to_gnu(locale)],
+        if self.metrics is None:
+            return self._translate(string, locale, context)
+
+        start = time.perf_counter()
+        translated = self._translate(string, locale, context)
+        elapsed = time.perf_counter() - start
+        self._record_lookup(string, locale, context.location, translated, elapsed)
+        return translated
+
+    def _translate(
+        self,
+        string: app_commands.locale_str,
+        locale: discord.Locale,
+        context: app_commands.TranslationContextTypes,
+    ) -> str | None:
+        if locale in self._missing_locales:
+            return None
+
+        if (
+            context.location is not app_commands.TranslationContextLocation.other
+            and "plural" not in string.extras
+        ):
+            return self._get_table_row(string).get(locale)
+
+        catalogs = self._catalogs.get(locale)
+        if catalogs is None:
+            return None
+
+        return _lookup(catalogs, string, context.data)
+
+    def _record_lookup(
+        self,
+        string: app_commands.locale_str,
+        locale: discord.Locale,
+        location: app_commands.TranslationContextLocation,
+        translated: str | None,
+        elapsed: float,
+    ) -> None:
+        assert self.metrics is not None
+
+        if translated is not None:
+            outcome = "hit"
+        elif locale in self._missing_locales or locale not in self._catalogs:
+            outcome = "no_catalog"
+        else:
+            outcome = "miss"
+            self.metrics.increment(
+                "translator_untranslated",
+                locale=str(locale),
+                message=string.message,
             )
-        except OSError:
-            return
 
-        # Normally the gettext module returns the message ID if no localization
-        # is found, but we want to replace it with None so discord.py knows
-        # that this string isn't localized.
-        t.add_fallback(EmptyTranslations())
-        # Let's add an EmptyTranslations fallback so we get empty strings
-        # for missing localizations instead.
+        labels = {"locale": str(locale), "location": location.name}
+        self.metrics.increment("translator_lookups", outcome=outcome, **labels)
+        self.metrics.observe("translator_lookup_seconds", elapsed, **labels)
 
-        plural: str | None = string.extras.get("plural")
+    async def translate_many(
+        self,
+        strings: Sequence[tuple[app_commands.locale_str, Any]],
+        locale: discord.Locale,
+    ) -> list[str | None]:
+        """Translates several strings into the same locale at once.
+
+        This resolves the locale's catalogs only once for all strings.
+
+        :param strings:
+            A sequence of strings paired with their data,
+            i.e. the number used to select a plural form.
+        :param locale: The locale to translate into.
+        :returns: The translated strings, or None where no translation exists.
+
+        """
+        start = time.perf_counter()
+
+        catalogs = None
+        if locale not in self._missing_locales:
+            catalogs = self._catalogs.get(locale)
+        if catalogs is None:
+            translations: list[str | None] = [None] * len(strings)
+        else:
+            translations = [_lookup(catalogs, string, data) for string, data in strings]
+
+        if self.metrics is not None:
+            # Spread the batch's latency evenly across each lookup
+            elapsed = (time.perf_counter() - start) / max(len(strings), 1)
+            location = app_commands.TranslationContextLocation.other
+            for (string, _), translated in zip(strings, translations):
+                self._record_lookup(string, locale, location, translated, elapsed)
+
+        return translations
+
+
+def _lookup(
+    catalogs: tuple[gettext.NullTranslations, ...],
+    string: app_commands.locale_str,
+    data: Any,
+) -> str | None:
+    plural: str | None = string.extras.get("plural")
+    for t in catalogs:
         if plural is not None:
-            assert isinstance(context.data, int)
-            translated = t.ngettext(string.message, plural, context.data)
+            assert isinstance(data, int)
+            translated = t.ngettext(string.message, plural, data)
         else:
             translated = t.gettext(string.message)
 
-        if translated == "":
-            return None
+        if translated != "":
+            return translated
 
-        return translated
+    return None
 
 
 def plural_locale_str(
@@ -103,8 +636,9 @@ def plural_locale_str(
 ) -> app_commands.locale_str:
     """A shorthand for defining a string with singular and plural variants.
 
-    This should be aliased to ngettext, ungettext, or dngettext
-    so the `xgettext` program can recognize the function.
+    The message extractor in utils/ recognizes this function directly,
+    but when using the `xgettext` program, it should be aliased to
+    ngettext, ungettext, or dngettext so the function can be recognized.
 
     """
     return app_commands.locale_str(singular, plural=plural, **kwargs)
@@ -121,22 +655,102 @@ async def translate(
     Unlike the methods built into discord.py, this will use the original message
     if a translation could not be found.
 
+    When the bot uses a :class:`GettextTranslator`, results are memoized
+    in its :attr:`~GettextTranslator.cache`.
+
+    """
+    (translated,) = await translate_many([(message, data)], obj, locale)
+    return translated
+
+
+async def translate_many(
+    messages: Iterable[app_commands.locale_str | tuple[app_commands.locale_str, Any]],
+    obj: DPyGT | discord.Interaction,
+    locale: discord.Locale | None = None,
+) -> list[str]:
+    """A shorthand for translating several messages into the same locale.
+
+    This behaves the same as :func:`translate()` for each message, but the
+    translator and locale are only resolved once. Messages that need data,
+    like the number for selecting a plural form, can be given as a
+    ``(message, data)`` tuple.
+
     """
+    requests = [m if isinstance(m, tuple) else (m, None) for m in messages]
+
     if isinstance(obj, commands.Bot):
         if locale is None:
-            return str(message)
+            return [str(message) for message, _ in requests]
+        bot = obj
+    else:
+        if locale is None:
+            locale = obj.locale
+        bot = obj.client
+        assert isinstance(bot, commands.Bot)
+
+    translator = bot.tree.translator
+    if translator is None:
+        return [str(message) for message, _ in requests]
+
+    if not isinstance(translator, GettextTranslator):
+        results: list[str] = []
+        for message, data in requests:
+            context = app_commands.TranslationContext(
+                location=app_commands.TranslationContextLocation.other,
+                data=data,
+            )
+            translated = await translator.translate(
+                message,
+                locale=locale,
+                context=context,
+            )
+            results.append(translated or str(message))
+        return results
+
+    results: list[str] = []
+    missed: list[tuple[int, Hashable]] = []
+    for i, (message, data) in enumerate(requests):
+        cache_key = translator.get_cache_key(message, locale, data)
+        translated = translator.cache.get(cache_key)
+        if translated is None:
+            missed.append((i, cache_key))
+            translated = str(message)
+        results.append(translated)
+
+    if translator.metrics is not None:
+        n_hits = len(requests) - len(missed)
+        if n_hits:
+            translator.metrics.increment(
+                "translate_cache", n_hits, locale=str(locale), result="hit"
+            )
+        if missed:
+            translator.metrics.increment(
+                "translate_cache", len(missed), locale=str(locale), result="miss"
+            )
 
-        assert obj.tree.translator is not None
-        context = app_commands.TranslationContext(
-            location=app_commands.TranslationContextLocation.other,
-            data=data,
+    if missed:
+        translations = await translator.translate_many(
+            [requests[i] for i, _ in missed],
+            locale,
         )
-        translated = await obj.tree.translator.translate(
-            message,
-            locale=locale,
-            context=context,
-        )
-    else:
-        translated = await obj.translate(message, data=data)
+        for (i, cache_key), translated in zip(missed, translations):
+            if translated is not None:
+                results[i] = translated
+            translator.cache.put(cache_key, results[i])
+
+    return results
+
 
-    return translated or str(message)
+async def translate_template(
+    message: app_commands.locale_str,
+    obj: DPyGT | discord.Interaction,
+    locale: discord.Locale | None = None,
+    data: Any = None,
+) -> Template:
+    """A shorthand for translating a message into a format template.
+
+    Templates are cached by their translated text, so each message only
+    gets parsed once per locale.
+
+    """
+    return compile_template(await translate(message, obj, locale, data))
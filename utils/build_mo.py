@@ -1,9 +1,42 @@
-"""Iterates through .po files in source packages and invokes msgfmt on them."""
+"""Compiles .po files in source packages into .mo files.
 
-import subprocess
+msgfmt is used if it is installed, otherwise a pure-Python compiler is used.
+Catalogs whose .mo file is newer than their .po file are skipped.
+"""
+
+import argparse
+import sys
 from pathlib import Path
 
-for po_path in Path("src").rglob("*.po"):
-    print(po_path)
-    output = po_path.with_suffix(".mo")
-    subprocess.check_call(["msgfmt", "-o", output, po_path])
+# setup.py compiles catalogs the same way when building the package
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from setup import load_catalog_module  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--bundle",
+        action="store_true",
+        help="Also pack the compiled catalogs of each package into a single bundle",
+    )
+    parser.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        help="Compile every catalog even if it is up to date",
+    )
+    args = parser.parse_args()
+
+    catalog = load_catalog_module()
+    files = [(po, po.with_suffix(".mo")) for po in Path("src").rglob("*.po")]
+    for mo_path in catalog.compile_po_files(files, force=args.force):
+        print(mo_path)
+
+    if args.bundle:
+        for bundle_path in catalog.bundle_mo_files(mo for _, mo in files):
+            print(bundle_path)
+
+
+if __name__ == "__main__":
+    main()
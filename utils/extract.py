@@ -0,0 +1,534 @@
+"""Extracts translatable messages from Python source files.
+
+Messages are extracted with a built-in parser that mirrors the output of
+``xgettext --add-comments``, or optionally with xgettext itself.
+Each source file is extracted separately and cached by its content hash,
+so only files that changed since the last extraction need to be re-parsed.
+
+This module is shared by the other utility scripts.
+"""
+
+import ast
+import datetime
+import hashlib
+import io
+import json
+import os
+import re
+import shutil
+import string
+import subprocess
+import tokenize
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Iterable, NamedTuple
+
+CACHE_DIR = Path(".extract_cache")
+
+XGETTEXT_ARGS = [
+    "xgettext",
+    # Extract comments from source
+    # https://www.gnu.org/software/gettext/manual/gettext.html#index-_002dc_002c-xgettext-option
+    "--add-comments",
+]
+
+# Bump this when the output of extract_python() changes to invalidate the cache
+EXTRACTOR_VERSION = "1"
+
+# Maps each keyword to the argument indices of its msgid, msgid_plural and msgctxt.
+# This includes xgettext's defaults for Python along with discord.py's locale_str.
+KEYWORDS: dict[str, tuple[int, int | None, int | None]] = {
+    "_": (0, None, None),
+    "gettext": (0, None, None),
+    "ugettext": (0, None, None),
+    "dgettext": (1, None, None),
+    "ngettext": (0, 1, None),
+    "ungettext": (0, 1, None),
+    "dngettext": (1, 2, None),
+    "pgettext": (1, None, 0),
+    "npgettext": (1, 2, 0),
+    "locale_str": (0, None, None),
+    "plural_locale_str": (0, 1, None),
+}
+
+PO_WIDTH = 79
+
+_PO_ESCAPES = {
+    "\\": "\\\\",
+    '"': '\\"',
+    "\a": "\\a",
+    "\b": "\\b",
+    "\f": "\\f",
+    "\n": "\\n",
+    "\r": "\\r",
+    "\t": "\\t",
+    "\v": "\\v",
+}
+_PO_ESCAPE = re.compile("|".join(map(re.escape, _PO_ESCAPES)))
+_PERCENT_DIRECTIVE = re.compile(
+    r"%(?:\([^)]*\))?[#0\- +]*(?:\*|\d+)?(?:\.(?:\*|\d+))?[hlL]?(.)"
+)
+_formatter = string.Formatter()
+
+
+class Message(NamedTuple):
+    """A message extracted from a single location in a source file."""
+
+    msgctxt: str | None
+    msgid: str
+    msgid_plural: str | None
+    comments: tuple[str, ...]
+    path: str
+    line: int
+
+
+class _Entry:
+    __slots__ = ("msgctxt", "msgid", "msgid_plural", "comments", "references")
+
+    def __init__(self, message: Message) -> None:
+        self.msgctxt = message.msgctxt
+        self.msgid = message.msgid
+        self.msgid_plural = message.msgid_plural
+        self.comments: list[str] = []
+        self.references: list[str] = []
+
+    def add(self, message: Message) -> None:
+        if self.msgid_plural is None:
+            self.msgid_plural = message.msgid_plural
+
+        # Like xgettext, skip comments that repeat the tail of existing comments
+        added = list(message.comments)
+        if not added or self.comments[-len(added) :] != added:
+            self.comments.extend(added)
+
+        reference = f"{message.path}:{message.line}"
+        if reference not in self.references:
+            self.references.append(reference)
+
+
+# xgettext
+
+
+def fix_charset(path: Path) -> None:
+    # Hide CHARSET warning by defaulting to utf-8
+    content_type_temp = rb'"Content-Type: text/plain; charset=CHARSET\n"'
+    content_type_utf8 = rb'"Content-Type: text/plain; charset=UTF-8\n"'
+    content_pot = path.read_bytes()
+    content_pot = content_pot.replace(content_type_temp, content_type_utf8)
+    path.write_bytes(content_pot)
+
+
+def run_xgettext(source_files: Iterable[Path], output_path: Path) -> None:
+    subprocess.check_call(
+        [
+            *XGETTEXT_ARGS,
+            # Always write the output, even if no messages were found
+            "--force-po",
+            "-o",
+            # Normalize generated source file references in POSIX style
+            PurePosixPath(output_path),
+            *(PurePosixPath(p) for p in source_files),
+        ],
+    )
+    fix_charset(output_path)
+
+
+def concatenate_po(po_paths: list[Path], output_path: Path) -> None:
+    if len(po_paths) == 1:
+        shutil.copyfile(po_paths[0], output_path)
+        return
+
+    subprocess.check_call(
+        [
+            "msgcat",
+            # Take the header from the first file
+            "--use-first",
+            "-o",
+            PurePosixPath(output_path),
+            *(PurePosixPath(p) for p in po_paths),
+        ]
+    )
+
+
+# Built-in extractor
+
+
+def get_comments(source: str) -> dict[tuple[int, int], tuple[str, ...]]:
+    """Returns the comments that xgettext would associate with each string token.
+
+    A block of comments applies to every string until the end of the
+    next line containing code, similar to how xgettext handles them.
+
+    :returns: A mapping of each string's (line, column) to its comments.
+
+    """
+    comments: list[str] = []
+    last_comment_line = 0
+    last_code_line = 0
+    strings: dict[tuple[int, int], tuple[str, ...]] = {}
+
+    readline = io.StringIO(source).readline
+    for token in tokenize.generate_tokens(readline):
+        if token.type == tokenize.COMMENT:
+            comments.append(token.string[1:].strip())
+            last_comment_line = token.start[0]
+        elif token.type in (tokenize.NEWLINE, tokenize.NL):
+            if last_code_line > last_comment_line:
+                comments = []
+        elif token.type in (tokenize.INDENT, tokenize.DEDENT, tokenize.ENDMARKER):
+            continue
+        else:
+            last_code_line = token.end[0]
+            if token.type == tokenize.STRING:
+                strings[token.start] = tuple(comments)
+
+    return strings
+
+
+def _get_keywords(tree: ast.Module) -> dict[str, tuple[int, int | None, int | None]]:
+    """Returns the keywords of a module, including aliases of known keywords."""
+    keywords = KEYWORDS.copy()
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.ImportFrom):
+            continue
+        for alias in node.names:
+            if alias.asname is not None and alias.name in KEYWORDS:
+                keywords[alias.asname] = KEYWORDS[alias.name]
+    return keywords
+
+
+def _get_string(node: ast.expr | None) -> str | None:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def extract_python(path: Path) -> list[Message]:
+    """Extracts the messages of a Python source file in the order they appear.
+
+    Besides xgettext's default keywords, this recognizes
+    :class:`discord.app_commands.locale_str` (including its ``plural``
+    extra), ``plural_locale_str``, and any of them imported under an alias.
+
+    """
+    source = path.read_text("utf-8")
+    tree = ast.parse(source, filename=str(path))
+    keywords = _get_keywords(tree)
+    comments = get_comments(source)
+    posix_path = str(PurePosixPath(path))
+
+    messages: list[tuple[tuple[int, int], Message]] = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+
+        if isinstance(node.func, ast.Name):
+            name = node.func.id
+        elif isinstance(node.func, ast.Attribute):
+            name = node.func.attr
+        else:
+            continue
+
+        spec = keywords.get(name)
+        if spec is None:
+            continue
+
+        args = node.args
+
+        def get_arg(i: int | None) -> ast.expr | None:
+            if i is None or i >= len(args):
+                return None
+            return args[i]
+
+        msgid_index, plural_index, context_index = spec
+        msgid_node = get_arg(msgid_index)
+        msgid = _get_string(msgid_node)
+        if msgid is None:
+            continue
+        assert msgid_node is not None
+
+        msgid_plural = None
+        if plural_index is not None:
+            msgid_plural = _get_string(get_arg(plural_index))
+            if msgid_plural is None:
+                continue
+        else:
+            # locale_str() accepts its plural form as an extra
+            for keyword in node.keywords:
+                if keyword.arg == "plural":
+                    msgid_plural = _get_string(keyword.value)
+
+        msgctxt = None
+        if context_index is not None:
+            msgctxt = _get_string(get_arg(context_index))
+            if msgctxt is None:
+                continue
+
+        position = (msgid_node.lineno, msgid_node.col_offset)
+        message = Message(
+            msgctxt=msgctxt,
+            msgid=msgid,
+            msgid_plural=msgid_plural,
+            comments=comments.get(position, ()),
+            path=posix_path,
+            line=msgid_node.lineno,
+        )
+        messages.append((position, message))
+
+    messages.sort(key=lambda m: m[0])
+    return [message for _, message in messages]
+
+
+def get_format_flags(*strings: str) -> list[str]:
+    """Returns the format flags that xgettext would mark the given strings with."""
+    flags: list[str] = []
+    if any(_is_percent_format(s) for s in strings):
+        flags.append("python-format")
+    if any(_is_brace_format(s) for s in strings):
+        flags.append("python-brace-format")
+    return flags
+
+
+def _is_percent_format(s: str) -> bool:
+    directives = [m[1] for m in _PERCENT_DIRECTIVE.finditer(s)]
+    if s.count("%") != sum(2 if d == "%" else 1 for d in directives):
+        return False
+    return any(d in "diouxXeEfFgGcrsa" for d in directives)
+
+
+def _is_brace_format(s: str) -> bool:
+    has_fields = False
+    try:
+        for _, field_name, _, _ in _formatter.parse(s):
+            if field_name is None:
+                continue
+
+            first = re.split(r"[.\[]", field_name, maxsplit=1)[0]
+            if not (first.isdigit() or first.isidentifier()):
+                # Automatic numbering like {} isn't accepted by xgettext
+                return False
+            has_fields = True
+    except ValueError:
+        return False
+    return has_fields
+
+
+def _escape_po(s: str) -> str:
+    return _PO_ESCAPE.sub(lambda m: _PO_ESCAPES[m[0]], s)
+
+
+def format_po_string(keyword: str, s: str) -> list[str]:
+    """Formats a keyword and its string, wrapping it the same way as xgettext."""
+    lines = [_escape_po(line) for line in re.split(r"(?<=\n)", s) if line]
+    if not lines:
+        return [f'{keyword} ""']
+    elif len(lines) == 1 and len(keyword) + len(lines[0]) + 3 <= PO_WIDTH:
+        return [f'{keyword} "{lines[0]}"']
+
+    formatted = [f'{keyword} ""']
+    for line in lines:
+        chunk = ""
+        # Break lines after spaces if they're too long
+        for word in re.split(r"(?<= )", line):
+            if chunk and len(chunk) + len(word) + 2 > PO_WIDTH:
+                formatted.append(f'"{chunk}"')
+                chunk = ""
+            chunk += word
+        formatted.append(f'"{chunk}"')
+    return formatted
+
+
+def format_references(references: list[str]) -> list[str]:
+    lines: list[str] = []
+    line = "#:"
+    for reference in references:
+        if line != "#:" and len(line) + len(reference) + 1 > PO_WIDTH:
+            lines.append(line)
+            line = "#:"
+        line += f" {reference}"
+    lines.append(line)
+    return lines
+
+
+def write_pot(messages: Iterable[Message], output_path: Path) -> None:
+    """Writes messages to a PO template in the same format as xgettext."""
+    entries: dict[tuple[str | None, str], _Entry] = {}
+    for message in messages:
+        key = (message.msgctxt, message.msgid)
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = _Entry(message)
+        entry.add(message)
+
+    creation_date = datetime.datetime.now().astimezone().strftime("%Y-%m-%d %H:%M%z")
+    header = [
+        "Project-Id-Version: PACKAGE VERSION",
+        "Report-Msgid-Bugs-To: ",
+        f"POT-Creation-Date: {creation_date}",
+        "PO-Revision-Date: YEAR-MO-DA HO:MI+ZONE",
+        "Last-Translator: FULL NAME <EMAIL@ADDRESS>",
+        "Language-Team: LANGUAGE <LL@li.org>",
+        "Language: ",
+        "MIME-Version: 1.0",
+        "Content-Type: text/plain; charset=UTF-8",
+        "Content-Transfer-Encoding: 8bit",
+    ]
+    if any(entry.msgid_plural is not None for entry in entries.values()):
+        header.append("Plural-Forms: nplurals=INTEGER; plural=EXPRESSION;")
+
+    lines = [
+        "# SOME DESCRIPTIVE TITLE.",
+        "# Copyright (C) YEAR THE PACKAGE'S COPYRIGHT HOLDER",
+        "# This file is distributed under the same license as the PACKAGE package.",
+        "# FIRST AUTHOR <EMAIL@ADDRESS>, YEAR.",
+        "#",
+        "#, fuzzy",
+        'msgid ""',
+        'msgstr ""',
+        *(f'"{_escape_po(line)}\\n"' for line in header),
+    ]
+
+    for entry in entries.values():
+        lines.append("")
+        lines.extend(f"#. {comment}".rstrip() for comment in entry.comments)
+        lines.extend(format_references(entry.references))
+
+        strings = [entry.msgid]
+        if entry.msgid_plural is not None:
+            strings.append(entry.msgid_plural)
+        flags = get_format_flags(*strings)
+        if flags:
+            lines.append(f"#, {', '.join(flags)}")
+
+        if entry.msgctxt is not None:
+            lines.extend(format_po_string("msgctxt", entry.msgctxt))
+        lines.extend(format_po_string("msgid", entry.msgid))
+        if entry.msgid_plural is None:
+            lines.append('msgstr ""')
+        else:
+            lines.extend(format_po_string("msgid_plural", entry.msgid_plural))
+            lines.append('msgstr[0] ""')
+            lines.append('msgstr[1] ""')
+
+    output_path.write_text("\n".join(lines) + "\n", "utf-8", newline="\n")
+
+
+# Caching
+
+
+def get_cache_dir(package: Path) -> Path:
+    """Returns the cache directory for a package, shared by every script."""
+    return CACHE_DIR / package.resolve().name
+
+
+def normalize_path(path: Path) -> Path:
+    """Returns a path relative to the current directory,
+    so each file is referenced the same way however it was given.
+    """
+    return Path(os.path.relpath(path.resolve()))
+
+
+def get_cache_key(path: Path, use_xgettext: bool) -> str:
+    """Hashes a source file's path and contents along with the extractor used."""
+    digest = hashlib.sha256()
+    if use_xgettext:
+        digest.update("\0".join(XGETTEXT_ARGS).encode())
+    else:
+        digest.update(f"extract_python {EXTRACTOR_VERSION}".encode())
+    digest.update(b"\0")
+    # The path is included since it appears in the extracted references
+    digest.update(str(PurePosixPath(path)).encode())
+    digest.update(b"\0")
+    digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _extract_to_cache(source: Path, cached: Path, use_xgettext: bool) -> None:
+    # Write to a temporary file first so an interrupted run can't leave
+    # behind a partial extraction that looks valid
+    temp = cached.with_suffix(".tmp")
+    if use_xgettext:
+        run_xgettext([source], temp)
+    else:
+        messages = extract_python(source)
+        temp.write_text(json.dumps(messages), "utf-8")
+    temp.replace(cached)
+
+
+def _read_cache(cached: Path) -> list[Message]:
+    data = json.loads(cached.read_text("utf-8"))
+    return [
+        Message(ctxt, msgid, plural, tuple(comments), path, line)
+        for ctxt, msgid, plural, comments, path, line in data
+    ]
+
+
+def extract_messages(
+    source_files: Iterable[Path],
+    output_path: Path,
+    *,
+    cache_dir: Path | None = None,
+    use_xgettext: bool = False,
+    max_workers: int | None = None,
+) -> int:
+    """Extracts messages from the given source files into a PO template.
+
+    :param source_files: The Python source files to extract from.
+    :param output_path: The path to write the PO template to.
+    :param cache_dir:
+        The directory to cache the messages of each source file in.
+        Cached files that are no longer used by any source file
+        are removed. If None, every file is extracted.
+    :param use_xgettext: If True, extract messages with xgettext.
+    :param max_workers: The maximum number of files to extract at once.
+    :returns: The number of source files that had to be extracted.
+
+    """
+    # Paths appear in references and cache keys, so they're normalized to keep
+    # scripts that spell them differently from invalidating each other's cache
+    source_files = [normalize_path(p) for p in source_files]
+    if cache_dir is None and use_xgettext:
+        run_xgettext(source_files, output_path)
+        return len(source_files)
+    elif cache_dir is None:
+        with ProcessPoolExecutor(max_workers) as executor:
+            results = list(executor.map(extract_python, source_files))
+        write_pot((m for messages in results for m in messages), output_path)
+        return len(source_files)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    suffix = ".po" if use_xgettext else ".json"
+    cached_paths = [
+        cache_dir / f"{get_cache_key(p, use_xgettext)}{suffix}" for p in source_files
+    ]
+    pending = [
+        (source, cached)
+        for source, cached in zip(source_files, cached_paths)
+        if not cached.is_file()
+    ]
+
+    if len(pending) > 1:
+        # xgettext runs in its own process, so threads are enough to wait on it
+        executor_cls = ThreadPoolExecutor if use_xgettext else ProcessPoolExecutor
+        with executor_cls(max_workers) as executor:
+            futures = [
+                executor.submit(_extract_to_cache, source, cached, use_xgettext)
+                for source, cached in pending
+            ]
+            # Propagate any exceptions
+            for future in futures:
+                future.result()
+    elif pending:
+        _extract_to_cache(*pending[0], use_xgettext)
+
+    used = set(cached_paths)
+    for path in cache_dir.iterdir():
+        if path not in used:
+            path.unlink()
+
+    if use_xgettext:
+        concatenate_po(cached_paths, output_path)
+    else:
+        write_pot((m for p in cached_paths for m in _read_cache(p)), output_path)
+
+    return len(pending)
@@ -1,12 +1,13 @@
 """Generates a .pot file from Python source files in a given directory."""
 
 import argparse
-import subprocess
 import sys
 from fnmatch import fnmatch
-from pathlib import Path, PurePosixPath
+from pathlib import Path
 from typing import Iterator
 
+from extract import extract_messages, get_cache_dir
+
 EXCLUDED = ["build", "env*", "venv*"]
 
 
@@ -26,54 +27,73 @@ def find_source_files(root: Path) -> Iterator[Path]:
         yield from dir.rglob("*.py")
 
 
-parser = argparse.ArgumentParser(description=__doc__)
-parser.add_argument(
-    "-f",
-    "--force",
-    action="store_true",
-    help="If a .pot file already exists, overwrite it",
-)
-parser.add_argument(
-    "-v",
-    "--verbose",
-    action="count",
-    default=0,
-    help="Increase output verbosity",
-)
-parser.add_argument(
-    "source",
-    default=".",
-    help="The directory to generate the file",
-    nargs="?",
-    type=Path,
-)
-args = parser.parse_args()
-
-source: Path = args.source
-
-if not source.is_dir():
-    sys.exit(f"ERROR: no directory found at {source}")
-
-output_path = source / f"{source.resolve().name}.pot"
-if not args.force and output_path.is_file():
-    sys.exit(f"ERROR: existing template at {output_path}, use -f/--force to overwrite")
-
-source_files = list(find_source_files(source))
-if not source_files:
-    sys.exit("ERROR: no .py source files found")
-
-if args.verbose:
-    for path in source_files:
-        print(path)
-
-subprocess.check_call(
-    [
-        "xgettext",
-        "--add-comments",
-        "-o",
-        PurePosixPath(output_path),
-        *(PurePosixPath(p) for p in source_files),
-    ],
-)
-
-print(f"Generated {output_path} from {len(source_files)} source file(s)")
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        help="If a .pot file already exists, overwrite it",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_false",
+        dest="use_cache",
+        help="Re-extract every source file instead of only those that changed",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=0,
+        help="Increase output verbosity",
+    )
+    parser.add_argument(
+        "source",
+        default=".",
+        help="The directory to generate the file",
+        nargs="?",
+        type=Path,
+    )
+    parser.add_argument(
+        "--xgettext",
+        action="store_true",
+        dest="use_xgettext",
+        help="Extract messages with xgettext instead of the built-in extractor",
+    )
+    args = parser.parse_args()
+
+    source: Path = args.source
+
+    if not source.is_dir():
+        sys.exit(f"ERROR: no directory found at {source}")
+
+    output_path = source / f"{source.resolve().name}.pot"
+    if not args.force and output_path.is_file():
+        sys.exit(
+            f"ERROR: existing template at {output_path}, use -f/--force to overwrite"
+        )
+
+    source_files = list(find_source_files(source))
+    if not source_files:
+        sys.exit("ERROR: no .py source files found")
+
+    if args.verbose:
+        for path in source_files:
+            print(path)
+
+    cache_dir = get_cache_dir(source) if args.use_cache else None
+    n_extracted = extract_messages(
+        source_files,
+        output_path,
+        cache_dir=cache_dir,
+        use_xgettext=args.use_xgettext,
+    )
+    if args.verbose:
+        print(f"Extracted messages from {n_extracted} changed source file(s)")
+
+    print(f"Generated {output_path} from {len(source_files)} source file(s)")
+
+
+if __name__ == "__main__":
+    main()